@@ -6,6 +6,8 @@ Main application entry point
 import streamlit as st
 from datetime import datetime, date, timedelta
 import pandas as pd
+import threading
+from streamlit.runtime.scriptrunner import add_script_run_ctx
 
 # Page configuration
 st.set_page_config(
@@ -53,7 +55,12 @@ if 'end_date' not in st.session_state:
 
 # Initialize automated report scheduler
 # This ensures reports are sent automatically without manual intervention
-if 'scheduler_initialized' not in st.session_state:
+def _init_scheduler():
+    """Register report generators and start the scheduler
+    
+    Runs on a background thread so importing the report stack stays off
+    the landing page's render path.
+    """
     try:
         from utils.scheduler import report_scheduler
         from utils.reports import ReportGenerator
@@ -72,25 +79,30 @@ if 'scheduler_initialized' not in st.session_state:
         # Start the scheduler background thread
         if not report_scheduler.running:
             report_scheduler.start_scheduler()
-            st.session_state.scheduler_initialized = True
+        st.session_state.scheduler_initialized = True
             
     except Exception as e:
-        st.error(f"Failed to initialize automated scheduler: {e}")
+        st.session_state.scheduler_error = str(e)
         st.session_state.scheduler_initialized = False
 
+if 'scheduler_initialized' not in st.session_state:
+    # Mark as pending so reruns don't start a second init thread
+    st.session_state.scheduler_initialized = None
+    init_thread = threading.Thread(target=_init_scheduler, daemon=True)
+    add_script_run_ctx(init_thread)
+    init_thread.start()
+
+if st.session_state.get('scheduler_error'):
+    st.error(f"Failed to initialize automated scheduler: {st.session_state.scheduler_error}")
+
 # Main app header
 st.title("🏢 Fortified Insurance Solutions")
-st.markdown("### Agency Performance Dashboard")
 
 # Sidebar navigation
 with st.sidebar:
-    st.markdown("# 🏢 Fortified Insurance")
-    st.markdown("---")
-    
-    st.markdown("### 📍 Navigation")
+    st.markdown("# 🏢 Fortified Insurance\n\n---\n\n### 📍 Navigation\n\n**📊 Dashboard**")
     
     # Navigation links to actual pages
-    st.markdown("**📊 Dashboard**")
     st.page_link("pages/1_📊_Dashboard.py", label="View Live Dashboard", icon="📊")
     
     st.markdown("**📋 Reports**")
@@ -99,19 +111,27 @@ with st.sidebar:
     st.markdown("**🔧 System Status**")
     st.page_link("pages/3_🔧_System_Status.py", label="Check System Status", icon="🔧")
     
-    st.markdown("---")
-    st.markdown("### 📧 Support")
-    st.markdown("For assistance, contact:")
-    st.markdown("**support@fortified.com**")
-    
-    # Add user info if available
-    st.markdown("---")
-    st.markdown("### 👤 User")
-    st.markdown("**Marc** - CEO")
-    st.markdown("*Fortified LaunchLab*")
+    # Support and user info share a single markdown block
+    st.markdown("""
+---
+
+### 📧 Support
 
-# Main landing page content
-st.markdown("## 👋 Welcome to Fortified Insurance Dashboard")
+For assistance, contact:
+
+**support@fortified.com**
+
+---
+
+### 👤 User
+
+**Marc** - CEO
+
+*Fortified LaunchLab*
+""")
+
+# Main landing page content (subtitle and welcome heading in one block)
+st.markdown("### Agency Performance Dashboard\n\n## 👋 Welcome to Fortified Insurance Dashboard")
 
 # Feature overview
 col1, col2, col3 = st.columns(3)
@@ -149,19 +169,15 @@ with col3:
     """)
     st.page_link("pages/3_🔧_System_Status.py", label="Check Status →", icon="🔧")
 
-st.markdown("---")
-
 # Quick status overview
-st.markdown("### 🎯 Quick Status Overview")
+st.markdown("---\n\n### 🎯 Quick Status Overview")
 
 # Test connection status
 try:
-    from utils.google_sheets_fallback import get_sheet_data_with_fallback
+    from utils.google_sheets_fallback import probe_data_source
     
     # Quick data test
-    test_data = get_sheet_data_with_fallback('Daily Agency Stats')
-    
-    if not test_data.empty:
+    if probe_data_source():
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
@@ -207,9 +223,10 @@ with st.expander("🚀 Quick Start Guide", expanded=False):
     """)
 
 # Footer
-st.markdown("---")
 st.markdown(
     """
+    ---
+    
     <div style='text-align: center; color: #888;'>
         <p>Fortified Insurance Dashboard v1.0 | Built with ❤️ by Fortified LaunchLab</p>
     </div>
@@ -2,19 +2,17 @@
 Script to check the actual structure of your Google Sheets
 """
 
+import string
+import numpy as np
 import streamlit as st
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from utils.sheets_cache import fetch_ranges
 
-# Load credentials
-credentials = service_account.Credentials.from_service_account_info(
-    st.secrets["gcp_service_account"],
-    scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
-)
-
-service = build('sheets', 'v4', credentials=credentials)
 spreadsheet_id = st.secrets["SPREADSHEET_ID"]
 
+# Column letters for the A1:Z preview range
+LETTERS = list(string.ascii_uppercase)
+SEP = '=' * 60
+
 # Check each sheet
 sheets_to_check = [
     "Daily Agency Stats",
@@ -22,41 +20,36 @@ sheets_to_check = [
     "Daily Lead Vendor Totals"
 ]
 
-for sheet_name in sheets_to_check:
-    print(f"\n{'='*60}")
-    print(f"Sheet: {sheet_name}")
-    print('='*60)
-    
-    # Get first 10 rows to see structure
-    range_name = f"{sheet_name}!A1:Z10"
-    result = service.spreadsheets().values().get(
-        spreadsheetId=spreadsheet_id,
-        range=range_name
-    ).execute()
-    
-    values = result.get('values', [])
+# Fetch every sheet's preview range in a single round trip
+ranges = tuple(f"{sheet_name}!A1:Z10" for sheet_name in sheets_to_check)
+sheet_values = fetch_ranges(spreadsheet_id, ranges, unformatted=True)
+
+for sheet_name, values in zip(sheets_to_check, sheet_values):
+    # Collect each sheet's report and write it with a single print
+    out = ["", SEP, f"Sheet: {sheet_name}", SEP]
     
     if not values:
-        print("No data found!")
+        out.append("No data found!")
+        print("\n".join(out))
         continue
     
     # Show headers (first row)
-    print(f"\nHeaders (Row 1): {len(values[0])} columns")
-    for i, header in enumerate(values[0]):
-        print(f"  Column {chr(65+i)}: '{header}'")
+    out.append(f"\nHeaders (Row 1): {len(values[0])} columns")
+    out.extend(f"  Column {letter}: '{header}'" for letter, header in zip(LETTERS, values[0]))
     
     # Show a few data rows
-    print(f"\nData rows (showing first 3):")
+    out.append("\nData rows (showing first 3):")
     for i, row in enumerate(values[1:4]):
-        if i >= 3:
-            break
-        print(f"  Row {i+2}: {row[:5]}..." if len(row) > 5 else f"  Row {i+2}: {row}")
+        out.append(f"  Row {i+2}: {row[:5]}..." if len(row) > 5 else f"  Row {i+2}: {row}")
     
     # Check for column count consistency
     if len(values) > 1:
         header_count = len(values[0])
-        data_counts = [len(row) for row in values[1:]]
-        if any(count != header_count for count in data_counts):
-            print(f"\n⚠️  WARNING: Inconsistent column counts!")
-            print(f"  Headers: {header_count} columns")
-            print(f"  Data rows: {set(data_counts)} columns")
\ No newline at end of file
+        data_counts = np.fromiter((len(row) for row in values[1:]), dtype=np.int32)
+        unique_counts = np.unique(data_counts)
+        if unique_counts.size > 1 or unique_counts[0] != header_count:
+            out.append("\n⚠️  WARNING: Inconsistent column counts!")
+            out.append(f"  Headers: {header_count} columns")
+            out.append(f"  Data rows: {unique_counts.tolist()} columns")
+    
+    print("\n".join(out))
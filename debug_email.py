@@ -9,6 +9,9 @@ import sys
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Submission port that uses implicit TLS instead of STARTTLS
+SMTPS_PORT = 465
+
 def test_email_settings():
     print("🔍 Debugging Email Settings...")
     print("=" * 50)
@@ -49,8 +52,10 @@ def test_email_settings():
     
     print("\n📧 Testing Email Service...")
     try:
-        # Test SMTP connection
+        # Test SMTP connection (loaded lazily - only needed past this point)
         import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
         
         print("  🔌 Testing SMTP connection...")
         
@@ -62,28 +67,38 @@ def test_email_settings():
         
         print(f"  📡 Connecting to {smtp_server}:{smtp_port}")
         
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()
-        print("  ✅ TLS connection established")
-        
-        server.login(username, password)
-        print("  ✅ SMTP login successful")
-        
-        # Send test email
-        from email.mime.text import MimeText
-        from email.mime.multipart import MimeMultipart
-        
-        msg = MimeMultipart()
+        # Build the test message once and reuse it for every recipient
+        recipients = [email_settings.sender_email]  # Send to self
+        msg = MIMEMultipart()
         msg['From'] = email_settings.sender_email
-        msg['To'] = email_settings.sender_email  # Send to self
+        msg['To'] = ", ".join(recipients)
         msg['Subject'] = "Test Email - Debug"
         
         body = "This is a test email from the debug script."
-        msg.attach(MimeText(body, 'plain'))
-        
+        msg.attach(MIMEText(body, 'plain'))
         text = msg.as_string()
-        server.sendmail(email_settings.sender_email, [email_settings.sender_email], text)
-        server.quit()
+        
+        # Connect the way the email service does: STARTTLS on the configured
+        # port, or implicit TLS when that port is the SMTPS port
+        if smtp_port == SMTPS_PORT:
+            server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=10)
+        else:
+            server = smtplib.SMTP(smtp_server, smtp_port, timeout=10)
+        try:
+            if smtp_port == SMTPS_PORT:
+                print("  ✅ TLS connection established")
+            elif email_settings.use_tls:
+                server.starttls()
+                print("  ✅ TLS connection established")
+            
+            server.login(username, password)
+            print("  ✅ SMTP login successful")
+            
+            # Reuse the authenticated session for every send
+            for recipient in recipients:
+                server.sendmail(email_settings.sender_email, [recipient], text)
+        finally:
+            server.quit()
         
         print("  ✅ Test email sent successfully!")
         return True
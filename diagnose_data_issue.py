@@ -3,99 +3,95 @@ Diagnose data reading issues from Google Sheets
 """
 
 import streamlit as st
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from utils.sheets_cache import fetch_range, fetch_ranges
+from utils.sheets_client import get_sheets_service
 
-# Load credentials
-credentials = service_account.Credentials.from_service_account_info(
-    st.secrets["gcp_service_account"],
-    scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
-)
+SEP = '=' * 60
 
-service = build('sheets', 'v4', credentials=credentials)
+service = get_sheets_service()
 spreadsheet_id = st.secrets["SPREADSHEET_ID"]
 
 # Focus on the problematic Agency Stats sheet
 sheet_name = "Daily Agency Stats"
-print(f"Diagnosing issues with: {sheet_name}")
-print("="*60)
+print(f"Diagnosing issues with: {sheet_name}\n{SEP}")
 
-# Get raw data without any processing
-range_name = f"{sheet_name}!A1:Z10"
-result = service.spreadsheets().values().get(
-    spreadsheetId=spreadsheet_id,
-    range=range_name,
-    valueRenderOption='UNFORMATTED_VALUE'  # Get raw values
-).execute()
+# The raw read and the formatted reads are independent, so issue them
+# concurrently - each worker thread uses its own Sheets client. The formatted
+# preview and the per-column reads share one batchGet.
+columns = ['A', 'B', 'C', 'D', 'E', 'F']
+with ThreadPoolExecutor(max_workers=2) as executor:
+    # Get raw data without any processing
+    raw_future = executor.submit(fetch_range, spreadsheet_id, f"{sheet_name}!A1:Z10", True)
+    formatted_future = executor.submit(
+        fetch_ranges,
+        spreadsheet_id,
+        (f"{sheet_name}!A1:Z5",) + tuple(f"{sheet_name}!{col}1:{col}5" for col in columns),
+        False
+    )
 
-values = result.get('values', [])
+values = raw_future.result()
+formatted_values, *column_values = formatted_future.result()
 
-print(f"\nRaw data from first 10 rows:")
+out = ["\nRaw data from first 10 rows:"]
 for i, row in enumerate(values):
-    print(f"\nRow {i+1} ({len(row)} columns):")
-    for j, cell in enumerate(row):
-        print(f"  Column {chr(65+j)}: Type={type(cell).__name__}, Value='{cell}'")
-    print()
+    out.append(f"\nRow {i+1} ({len(row)} columns):")
+    out.extend(f"  Column {chr(65+j)}: Type={type(cell).__name__}, Value='{cell}'" for j, cell in enumerate(row))
+    out.append("")
 
 # Try different read methods
-print("\n" + "="*60)
-print("Testing different read approaches:")
+out.append(f"\n{SEP}")
+out.append("Testing different read approaches:")
 
 # Method 1: Read with formatted values
-result_formatted = service.spreadsheets().values().get(
-    spreadsheetId=spreadsheet_id,
-    range=f"{sheet_name}!A1:Z5",
-    valueRenderOption='FORMATTED_VALUE'
-).execute()
-
-print("\n1. With FORMATTED_VALUE:")
-formatted_values = result_formatted.get('values', [])
-for i, row in enumerate(formatted_values[:3]):
-    print(f"   Row {i+1}: {row[:5]}...")
+out.append("\n1. With FORMATTED_VALUE:")
+out.extend(f"   Row {i+1}: {row[:5]}..." for i, row in enumerate(formatted_values[:3]))
 
 # Method 2: Try reading specific ranges
-print("\n2. Reading specific columns:")
-for col in ['A', 'B', 'C', 'D', 'E', 'F']:
-    result_col = service.spreadsheets().values().get(
-        spreadsheetId=spreadsheet_id,
-        range=f"{sheet_name}!{col}1:{col}5"
-    ).execute()
-    col_values = result_col.get('values', [])
-    print(f"   Column {col}: {[v[0] if v else 'EMPTY' for v in col_values]}")
+out.append("\n2. Reading specific columns:")
+out.extend(f"   Column {col}: {[v[0] if v else 'EMPTY' for v in col_values]}"
+           for col, col_values in zip(columns, column_values))
+print("\n".join(out))
 
 # Check for any special formatting or merged cells
-print("\n" + "="*60)
-print("Checking sheet properties:")
+print(f"\n{SEP}\nChecking sheet properties:")
 
 # Get spreadsheet metadata
 spreadsheet = service.spreadsheets().get(
     spreadsheetId=spreadsheet_id,
-    includeGridData=False
+    includeGridData=False,
+    fields='sheets(properties(title,sheetId,gridProperties))'
 ).execute()
 
 # Find the sheet
 for sheet in spreadsheet.get('sheets', []):
     if sheet['properties']['title'] == sheet_name:
         props = sheet['properties']
-        print(f"Sheet ID: {props['sheetId']}")
-        print(f"Grid Properties: {props.get('gridProperties', {})}")
+        print(f"Sheet ID: {props['sheetId']}\nGrid Properties: {props.get('gridProperties', {})}")
         
 # Create a simple dataframe test
-print("\n" + "="*60)
-print("Testing pandas DataFrame creation:")
+print(f"\n{SEP}\nTesting pandas DataFrame creation:")
 
 if len(values) > 2:
     # Try with row 2 as headers (as we discovered earlier)
     try:
-        df = pd.DataFrame(values[2:], columns=values[1])
-        print(f"DataFrame created successfully with shape: {df.shape}")
-        print(f"Columns: {list(df.columns)}")
-        print(f"\nFirst row data types:")
-        for col in df.columns[:5]:
-            if len(df) > 0:
-                print(f"  {col}: {type(df.iloc[0][col])}")
+        df = pd.DataFrame.from_records(values[2:], columns=values[1])
+        # Agency Stats numeric columns arrive as raw numbers (UNFORMATTED_VALUE),
+        # so type them up front instead of leaving them as object
+        numeric_columns = ['FE', 'Adroit', 'Total Rev', 'QW', 'QS', 'SF', 'Total Leads']
+        df = df.astype({col: 'float64' for col in numeric_columns if col in df.columns}, errors='ignore')
+        out = [
+            f"DataFrame created successfully with shape: {df.shape}",
+            f"Columns: {list(df.columns)}",
+            "\nFirst row data types:"
+        ]
+        if len(df) > 0:
+            out.extend(f"  {col}: {type(df.iloc[0][col])}" for col in df.columns[:5])
+        print("\n".join(out))
     except Exception as e:
-        print(f"Error creating DataFrame: {e}")
-        print(f"Header row (row 2): {values[1]}")
-        print(f"First data row (row 3): {values[2] if len(values) > 2 else 'No data'}")
\ No newline at end of file
+        print("\n".join([
+            f"Error creating DataFrame: {e}",
+            f"Header row (row 2): {values[1]}",
+            f"First data row (row 3): {values[2] if len(values) > 2 else 'No data'}"
+        ]))
\ No newline at end of file
@@ -3,15 +3,21 @@ Diagnostic tool to check Google Sheets structure
 Run this to see what columns are actually in your sheets
 """
 
+import re
 import streamlit as st
 import pandas as pd
 from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from utils.google_sheets import (
     load_agency_stats, 
     load_agent_totals, 
     load_vendor_totals
 )
 
+# Currency formatting characters stripped before numeric conversion
+_CURRENCY_RE = re.compile(r'[\$,]')
+
 st.set_page_config(page_title="Sheet Diagnostics", page_icon="🔍")
 
 st.title("🔍 Google Sheets Diagnostic Tool")
@@ -23,10 +29,19 @@ yesterday = date.today() - timedelta(days=1)
 st.markdown("### Loading data from yesterday...")
 
 try:
-    # Load each sheet
-    agency_df = load_agency_stats(yesterday, yesterday)
-    agent_df = load_agent_totals(yesterday, yesterday)
-    vendor_df = load_vendor_totals(yesterday, yesterday)
+    # Load each sheet concurrently - the requests are independent, and each
+    # loader builds its own Sheets client so nothing is shared across threads
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=3, initializer=lambda: add_script_run_ctx(ctx=ctx)) as executor:
+        agency_df, agent_df, vendor_df = executor.map(
+            lambda loader: loader(yesterday, yesterday),
+            [load_agency_stats, load_agent_totals, load_vendor_totals]
+        )
+    
+    # Arrow-backed dtypes let the string scans below run in Arrow's C kernels
+    agency_df = agency_df.convert_dtypes(dtype_backend="pyarrow")
+    agent_df = agent_df.convert_dtypes(dtype_backend="pyarrow")
+    vendor_df = vendor_df.convert_dtypes(dtype_backend="pyarrow")
     
     # Display Agency Stats
     st.markdown("---")
@@ -34,9 +49,10 @@ try:
     if not agency_df.empty:
         st.write(f"**Shape:** {agency_df.shape[0]} rows, {agency_df.shape[1]} columns")
         st.write("**Columns:**")
+        sample = agency_df.head(1).to_dict(orient='records')[0] if len(agency_df) else {}
         for i, col in enumerate(agency_df.columns):
             dtype = str(agency_df[col].dtype)
-            sample_val = agency_df[col].iloc[0] if len(agency_df) > 0 else "N/A"
+            sample_val = sample.get(col, "N/A")
             st.write(f"{i+1}. `{col}` - Type: {dtype} - Sample: {sample_val}")
         
         st.markdown("**First 5 rows:**")
@@ -44,9 +60,13 @@ try:
         
         # Check for revenue columns
         st.markdown("**Potential Revenue Columns:**")
-        for col in agency_df.columns:
-            if any(keyword in col.lower() for keyword in ['rev', 'revenue', 'total']):
-                total = pd.to_numeric(agency_df[col].astype(str).str.replace(',', '').str.replace('$', ''), errors='coerce').sum()
+        revenue_candidates = [col for col in agency_df.columns
+                              if any(keyword in col.lower() for keyword in ['rev', 'revenue', 'total'])]
+        if revenue_candidates:
+            # Strip '$' and ',' from all candidate columns in a single regex pass
+            cleaned = agency_df[revenue_candidates].astype("string[pyarrow]").replace(_CURRENCY_RE, '', regex=True)
+            totals = cleaned.apply(pd.to_numeric, errors='coerce').sum()
+            for col, total in totals.items():
                 st.write(f"- `{col}`: Total = ${total:,.2f}")
     else:
         st.warning("Agency stats sheet is empty!")
@@ -57,9 +77,10 @@ try:
     if not agent_df.empty:
         st.write(f"**Shape:** {agent_df.shape[0]} rows, {agent_df.shape[1]} columns")
         st.write("**Columns:**")
+        sample = agent_df.head(1).to_dict(orient='records')[0] if len(agent_df) else {}
         for i, col in enumerate(agent_df.columns):
             dtype = str(agent_df[col].dtype)
-            sample_val = agent_df[col].iloc[0] if len(agent_df) > 0 else "N/A"
+            sample_val = sample.get(col, "N/A")
             st.write(f"{i+1}. `{col}` - Type: {dtype} - Sample: {sample_val}")
         
         st.markdown("**First 5 rows:**")
@@ -69,9 +90,13 @@ try:
         if 'Revenue' in agent_df.columns and 'Agent Name' in agent_df.columns:
             st.markdown("**Agent Revenue Summary:**")
             agent_summary = agent_df[['Agent Name', 'Revenue']].copy()
-            agent_summary['Revenue'] = pd.to_numeric(agent_summary['Revenue'].astype(str).str.replace(',', '').str.replace('$', ''), errors='coerce')
-            agent_summary = agent_summary.sort_values('Revenue', ascending=False).head(10)
-            st.dataframe(agent_summary)
+            agent_summary['Revenue'] = pd.to_numeric(agent_summary['Revenue'].astype("string[pyarrow]").str.replace(_CURRENCY_RE, '', regex=True), errors='coerce')
+            agent_summary = agent_summary.nlargest(10, 'Revenue', keep='first')
+            st.dataframe(
+                agent_summary,
+                column_config={"Revenue": st.column_config.NumberColumn(format="$%.2f")},
+                hide_index=True
+            )
     else:
         st.warning("Agent totals sheet is empty!")
     
@@ -81,9 +106,10 @@ try:
     if not vendor_df.empty:
         st.write(f"**Shape:** {vendor_df.shape[0]} rows, {vendor_df.shape[1]} columns")
         st.write("**Columns:**")
+        sample = vendor_df.head(1).to_dict(orient='records')[0] if len(vendor_df) else {}
         for i, col in enumerate(vendor_df.columns):
             dtype = str(vendor_df[col].dtype)
-            sample_val = vendor_df[col].iloc[0] if len(vendor_df) > 0 else "N/A"
+            sample_val = sample.get(col, "N/A")
             st.write(f"{i+1}. `{col}` - Type: {dtype} - Sample: {sample_val}")
         
         st.markdown("**First 5 rows:**")
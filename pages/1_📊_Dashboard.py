@@ -2,31 +2,50 @@
 Main Dashboard Page - Real-time agency performance metrics
 """
 
+import io
+import zipfile
+from functools import lru_cache
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from datetime import datetime, date, timedelta
 try:
     from utils.google_sheets import (
-        load_agency_stats, 
-        load_agent_totals, 
-        load_vendor_totals,
+        load_all_dashboard_sheets,
+        load_daily_revenue,
         get_agency_list
     )
 except ImportError:
     # Fallback when Google Sheets is unavailable
     from utils.google_sheets_fallback import get_sheet_data_with_fallback
     
-    def load_agency_stats(start_date, end_date):
-        return get_sheet_data_with_fallback("Daily Agency Stats")
-    
-    def load_agent_totals(start_date, end_date):
-        return get_sheet_data_with_fallback("Daily Agent Totals")
+    # Cache on (start_date, end_date) like the primary loaders so reruns
+    # from widget interactions don't re-read the sheets
+    @st.cache_data(ttl=300, show_spinner=False)
+    def load_all_dashboard_sheets(start_date, end_date, agency=None):
+        agency_df = get_sheet_data_with_fallback("Daily Agency Stats")
+        if 'Date' in agency_df.columns:
+            agency_df['Date'] = pd.to_datetime(agency_df['Date'], errors='coerce')
+        frames = (
+            agency_df,
+            get_sheet_data_with_fallback("Daily Agent Totals"),
+            get_sheet_data_with_fallback("Daily Lead Vendor Totals"),
+        )
+        if agency is None:
+            return frames
+        return tuple(
+            df[df['Agency'] == agency] if 'Agency' in df.columns else df
+            for df in frames
+        )
     
-    def load_vendor_totals(start_date, end_date):
-        return get_sheet_data_with_fallback("Daily Lead Vendor Totals")
+    @st.cache_data(ttl=300, show_spinner=False)
+    def load_daily_revenue(start_date, end_date, agency=None):
+        agency_df = load_all_dashboard_sheets(start_date, end_date, agency)[0]
+        if 'Date' not in agency_df.columns or 'Total Rev' not in agency_df.columns:
+            return pd.DataFrame()
+        return agency_df.groupby('Date', as_index=False)['Total Rev'].sum()
     
+    @st.cache_data(ttl=3600, show_spinner=False)
     def get_agency_list():
         df = get_sheet_data_with_fallback("Daily Agency Stats")
         if 'Agency' in df.columns:
@@ -41,6 +60,143 @@ from utils.calculations import (
     get_campaign_performance
 )
 
+# Metric calculations only change with the loaded data, so cache them on the
+# DataFrame contents; tab switches and searches then skip re-aggregating
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_agency_stats(agency_df, agent_df, vendor_df):
+    # Reuse the processed agent and campaign frames the other sections cache
+    # instead of building them a second time inside aggregate_agency_stats
+    return aggregate_agency_stats(agency_df, agent_df, vendor_df,
+                                  agent_calc=cached_agent_metrics(agent_df),
+                                  vendor_calc=cached_campaign_metrics(vendor_df))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_agent_metrics(agent_df):
+    return calculate_agent_profitability(agent_df)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_top_performers(agent_metrics, n=10):
+    # agent_metrics is already processed; passing it as agent_calc keeps it
+    # from going through calculate_agent_profitability a second time
+    return get_top_performers(agent_metrics, n=n, agent_calc=agent_metrics)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_at_risk_agents(agent_metrics):
+    return get_at_risk_agents(agent_metrics, agent_calc=agent_metrics)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_agent_search_index(agent_metrics):
+    """Lowercased agent names for substring search, built once per data load"""
+    return agent_metrics['agent'].fillna('').astype(str).str.lower().to_numpy(dtype=str)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_campaign_metrics(vendor_df):
+    return calculate_campaign_roas(vendor_df)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_campaign_performance(campaign_metrics, sort_by='ROAS', ascending=False):
+    return get_campaign_performance(campaign_metrics, sort_by=sort_by, ascending=ascending,
+                                    vendor_calc=campaign_metrics)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def build_export_zip(export_data):
+    """Pack each DataFrame as a CSV into an in-memory zip archive"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, df in export_data.items():
+            archive.writestr(f"{name}.csv", df.to_csv(index=False))
+    return buffer.getvalue()
+
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def roas_bar_figure(vendors, roas):
+    """Build the Top Campaigns by ROAS bar chart from float32 arrays"""
+    # Plotly is heavy to import, so only load it when a chart is drawn
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=vendors,
+        y=roas,
+        marker_color=np.select([roas >= 2, roas >= 1], ['green', 'orange'], default='red'),
+        text=np.char.add(np.char.mod('%.2f', roas), 'x'),
+        textposition='outside'
+    ))
+    
+    fig.update_layout(
+        title="Top Campaigns by ROAS",
+        xaxis_title="Campaign/Vendor",
+        yaxis_title="ROAS",
+        height=400,
+        showlegend=False
+    )
+    return fig
+
+
+@lru_cache(maxsize=512)
+def format_long_date(d: date) -> str:
+    """Format a date as e.g. 'January 05, 2025' for the header line"""
+    return d.strftime('%B %d, %Y')
+
+
+# Calculated metric columns shown in the tables, mapped to display names
+AGENT_DISPLAY = {
+    'agent': 'Agent',
+    'totalSales': 'Sales',
+    'revenue': 'Revenue',
+    'agentProfitability': 'Profit',
+    'closingRatio': 'Close %'
+}
+
+CAMPAIGN_DISPLAY = {
+    'vendor': 'Vendor',
+    'leads': 'Leads',
+    'sales': 'Sales',
+    'revenue': 'Revenue',
+    'leadSpend': 'Spend',
+    'ROAS': 'ROAS',
+    'profit': 'Profit'
+}
+
+
+# Styler formats for the display columns, applied once per table
+AGENT_FORMATS = {'Revenue': '${:,.0f}', 'Profit': '${:,.0f}', 'Close %': '{:.1f}%'}
+CAMPAIGN_FORMATS = {'Revenue': '${:,.0f}', 'Spend': '${:,.0f}', 'Profit': '${:,.0f}', 'ROAS': '{:.2f}x'}
+
+
+def styled_table(df: pd.DataFrame, display: dict, formats: dict):
+    """Select and rename metric columns, formatted through a Styler"""
+    display_df = df[[col for col in display if col in df.columns]].rename(columns=display)
+    formats = {col: fmt for col, fmt in formats.items() if col in display_df.columns}
+    
+    # Missing values show as zero, as they did with per-cell formatting
+    return display_df.fillna({col: 0 for col in formats}).style.format(formats)
+
+
+def agent_table(df: pd.DataFrame):
+    """Select, rename and format agent metrics for display"""
+    return styled_table(df, AGENT_DISPLAY, AGENT_FORMATS)
+
+
+def campaign_table(df: pd.DataFrame):
+    """Select, rename and format campaign metrics for display"""
+    return styled_table(df, CAMPAIGN_DISPLAY, CAMPAIGN_FORMATS)
+
+
+def refresh_data_button():
+    """Clear the cached sheet data and rerun when Refresh Data is clicked"""
+    if st.button("🔄 Refresh Data"):
+        st.cache_data.clear()
+        st.rerun()
+
+
 # Page config
 st.set_page_config(
     page_title="Dashboard - Fortified Insurance",
@@ -58,7 +214,7 @@ with col1:
     try:
         agencies = get_agency_list()
         agency_options = ["All Agencies"] + agencies
-    except:
+    except Exception:
         agency_options = ["All Agencies"]
     
     selected_agency = st.selectbox(
@@ -100,39 +256,24 @@ else:  # Custom
         end_date = st.date_input("End Date", value=date.today())
 
 # Display selected date range
-st.markdown(f"**Showing data from {start_date.strftime('%B %d, %Y')} to {end_date.strftime('%B %d, %Y')}**")
+st.markdown(f"**Showing data from {format_long_date(start_date)} to {format_long_date(end_date)}**")
 
 # Load data
 try:
     with st.spinner("Loading data..."):
-        # Load all data
-        agency_df = load_agency_stats(start_date, end_date)
-        agent_df = load_agent_totals(start_date, end_date)
-        vendor_df = load_vendor_totals(start_date, end_date)
+        # Load all data in one batched Sheets request, filtered to the selected agency
+        agency_filter = None if selected_agency == "All Agencies" else selected_agency
+        agency_df, agent_df, vendor_df = load_all_dashboard_sheets(start_date, end_date, agency_filter)
         
-        # Filter by selected agency if not "All Agencies"
-        if selected_agency != "All Agencies":
-            # Check for both possible column names
-            if not agency_df.empty:
-                if 'Agency' in agency_df.columns:
-                    agency_df = agency_df[agency_df['Agency'] == selected_agency]
-                elif 'agency' in agency_df.columns:
-                    agency_df = agency_df[agency_df['agency'] == selected_agency]
-            
-            if not agent_df.empty:
-                if 'Agency' in agent_df.columns:
-                    agent_df = agent_df[agent_df['Agency'] == selected_agency]
-                elif 'agency' in agent_df.columns:
-                    agent_df = agent_df[agent_df['agency'] == selected_agency]
-            
-            if not vendor_df.empty:
-                if 'Agency' in vendor_df.columns:
-                    vendor_df = vendor_df[vendor_df['Agency'] == selected_agency]
-                elif 'agency' in vendor_df.columns:
-                    vendor_df = vendor_df[vendor_df['agency'] == selected_agency]
+        # Nothing to aggregate or chart when the period has no data; the
+        # empty result is cached too, so keep the refresh control available
+        if agency_df.empty and agent_df.empty and vendor_df.empty:
+            st.info("No data in the selected period.")
+            refresh_data_button()
+            st.stop()
         
         # Calculate aggregate stats
-        stats = aggregate_agency_stats(agency_df, agent_df, vendor_df)
+        stats = cached_agency_stats(agency_df, agent_df, vendor_df)
         
 except Exception as e:
     st.error(f"Error loading data: {str(e)}")
@@ -178,64 +319,24 @@ with col4:
 
 st.markdown("---")
 
-# Create two columns for agent and campaign data
-left_col, right_col = st.columns(2)
-
-with left_col:
+# Agent and campaign sections are fragments, so tab switches and agent
+# searches rerun only their own section instead of the whole page
+@st.fragment
+def render_agent_performance(agent_df):
     st.markdown("### 👥 Agent Performance")
     
     if not agent_df.empty:
         # Calculate agent metrics
-        agent_metrics = calculate_agent_profitability(agent_df)
+        agent_metrics = cached_agent_metrics(agent_df)
         
         # Create tabs for different views
         tab1, tab2, tab3 = st.tabs(["Top Performers", "At Risk", "All Agents"])
         
-        # Define column mappings once for all tabs
-        column_mappings = {
-            'agent': ['agent', 'Agent Name', 'Agent', 'agentName'],
-            'totalSales': ['totalSales', 'Sales', 'Total Sales', 'sales'],
-            'revenue': ['revenue', 'Revenue', 'Total Revenue', 'totalRevenue'],
-            'agentProfitability': ['agentProfitability', 'Profit', 'profitability', 'Agent Profitability'],
-            'closingRatio': ['closingRatio', 'Closing Ratio', 'Close Rate', 'closeRate']
-        }
-        
         with tab1:
-            top_agents = get_top_performers(agent_metrics, n=10)
+            top_agents = cached_top_performers(agent_metrics, n=10)
             if not top_agents.empty:
-                
-                # Find which columns actually exist
-                display_cols = []
-                display_names = []
-                
-                for desired_col, possible_names in column_mappings.items():
-                    for col_name in possible_names:
-                        if col_name in top_agents.columns:
-                            display_cols.append(col_name)
-                            if desired_col == 'agent':
-                                display_names.append('Agent')
-                            elif desired_col == 'totalSales':
-                                display_names.append('Sales')
-                            elif desired_col == 'revenue':
-                                display_names.append('Revenue')
-                            elif desired_col == 'agentProfitability':
-                                display_names.append('Profit')
-                            elif desired_col == 'closingRatio':
-                                display_names.append('Close %')
-                            break
-                
-                if display_cols:
-                    display_df = top_agents[display_cols].copy()
-                    display_df.columns = display_names
-                    
-                    # Format currency columns
-                    if 'Revenue' in display_df.columns:
-                        display_df['Revenue'] = display_df['Revenue'].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "$0")
-                    if 'Profit' in display_df.columns:
-                        display_df['Profit'] = display_df['Profit'].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "$0")
-                    if 'Close %' in display_df.columns:
-                        display_df['Close %'] = display_df['Close %'].apply(lambda x: f"{x:.1f}%" if pd.notna(x) else "0.0%")
-                    
+                display_df = agent_table(top_agents)
+                if not display_df.data.columns.empty:
                     st.dataframe(display_df, use_container_width=True, hide_index=True)
                 else:
                     st.info("Agent data structure not recognized. Available columns: " + ", ".join(top_agents.columns))
@@ -247,78 +348,15 @@ with left_col:
                     least_negative = agent_metrics.nlargest(5, 'agentProfitability')
                     if not least_negative.empty:
                         st.markdown("**Least Negative Performers:**")
-                        display_cols = []
-                        display_names = []
-                        
-                        for desired_col, possible_names in column_mappings.items():
-                            for col_name in possible_names:
-                                if col_name in least_negative.columns:
-                                    display_cols.append(col_name)
-                                    if desired_col == 'agent':
-                                        display_names.append('Agent')
-                                    elif desired_col == 'totalSales':
-                                        display_names.append('Sales')
-                                    elif desired_col == 'revenue':
-                                        display_names.append('Revenue')
-                                    elif desired_col == 'agentProfitability':
-                                        display_names.append('Profit')
-                                    elif desired_col == 'closingRatio':
-                                        display_names.append('Close %')
-                                    break
-                        
-                        if display_cols:
-                            display_df = least_negative[display_cols].copy()
-                            display_df.columns = display_names
-                            
-                            if 'Revenue' in display_df.columns:
-                                display_df['Revenue'] = display_df['Revenue'].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "$0")
-                            if 'Profit' in display_df.columns:
-                                display_df['Profit'] = display_df['Profit'].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "$0")
-                            if 'Close %' in display_df.columns:
-                                display_df['Close %'] = display_df['Close %'].apply(lambda x: f"{x:.1f}%" if pd.notna(x) else "0.0%")
-                            
-                            st.dataframe(display_df, use_container_width=True, hide_index=True)
+                        st.dataframe(agent_table(least_negative), use_container_width=True, hide_index=True)
                 else:
                     st.info("No agent data available for the selected period")
         
         with tab2:
-            at_risk = get_at_risk_agents(agent_metrics)
+            at_risk = cached_at_risk_agents(agent_metrics)
             if not at_risk.empty:
                 st.warning(f"⚠️ {len(at_risk)} agents with profitability < ${200}")
-                
-                # Use same column mapping logic
-                display_cols = []
-                display_names = []
-                
-                for desired_col, possible_names in column_mappings.items():
-                    for col_name in possible_names:
-                        if col_name in at_risk.columns:
-                            display_cols.append(col_name)
-                            if desired_col == 'agent':
-                                display_names.append('Agent')
-                            elif desired_col == 'totalSales':
-                                display_names.append('Sales')
-                            elif desired_col == 'revenue':
-                                display_names.append('Revenue')
-                            elif desired_col == 'agentProfitability':
-                                display_names.append('Profit')
-                            elif desired_col == 'closingRatio':
-                                display_names.append('Close %')
-                            break
-                
-                if display_cols:
-                    display_df = at_risk[display_cols].copy()
-                    display_df.columns = display_names
-                    
-                    # Format columns
-                    if 'Revenue' in display_df.columns:
-                        display_df['Revenue'] = display_df['Revenue'].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "$0")
-                    if 'Profit' in display_df.columns:
-                        display_df['Profit'] = display_df['Profit'].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "$0")
-                    if 'Close %' in display_df.columns:
-                        display_df['Close %'] = display_df['Close %'].apply(lambda x: f"{x:.1f}%" if pd.notna(x) else "0.0%")
-                    
-                    st.dataframe(display_df, use_container_width=True, hide_index=True)
+                st.dataframe(agent_table(at_risk), use_container_width=True, hide_index=True)
             else:
                 st.success("✅ No at-risk agents!")
         
@@ -326,189 +364,76 @@ with left_col:
             # Show all agents with search
             search = st.text_input("Search agents...", key="agent_search")
             
-            display_df = agent_metrics.copy()
-            
-            # Find agent column name
-            agent_col = None
-            for col in ['agent', 'Agent Name', 'Agent', 'agentName']:
-                if col in display_df.columns:
-                    agent_col = col
-                    break
-            
-            if search and agent_col:
-                display_df = display_df[display_df[agent_col].str.contains(search, case=False, na=False)]
+            display_df = agent_metrics
+            if search and 'agent' in display_df.columns:
+                agent_names = cached_agent_search_index(display_df)
+                display_df = display_df[np.char.find(agent_names, search.lower()) >= 0]
             
             if not display_df.empty:
-                # Use same column mapping logic as above
-                display_cols = []
-                display_names = []
-                
-                for desired_col, possible_names in column_mappings.items():
-                    for col_name in possible_names:
-                        if col_name in display_df.columns:
-                            display_cols.append(col_name)
-                            if desired_col == 'agent':
-                                display_names.append('Agent')
-                            elif desired_col == 'totalSales':
-                                display_names.append('Sales')
-                            elif desired_col == 'revenue':
-                                display_names.append('Revenue')
-                            elif desired_col == 'agentProfitability':
-                                display_names.append('Profit')
-                            elif desired_col == 'closingRatio':
-                                display_names.append('Close %')
-                            break
-                
-                if display_cols:
-                    display_df = display_df[display_cols].copy()
-                    display_df.columns = display_names
-                    
-                    # Format columns
-                    if 'Revenue' in display_df.columns:
-                        display_df['Revenue'] = display_df['Revenue'].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "$0")
-                    if 'Profit' in display_df.columns:
-                        display_df['Profit'] = display_df['Profit'].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "$0")
-                    if 'Close %' in display_df.columns:
-                        display_df['Close %'] = display_df['Close %'].apply(lambda x: f"{x:.1f}%" if pd.notna(x) else "0.0%")
-                    
-                    st.dataframe(display_df, use_container_width=True, hide_index=True)
+                st.dataframe(agent_table(display_df), use_container_width=True, hide_index=True)
             else:
                 st.info("No agents found matching your search")
     else:
         st.info("No agent data available for the selected period")
 
-with right_col:
+@st.fragment
+def render_campaign_performance(vendor_df):
     st.markdown("### 📊 Campaign Performance")
     
     if not vendor_df.empty:
         # Calculate campaign metrics
-        campaign_metrics = calculate_campaign_roas(vendor_df)
+        campaign_metrics = cached_campaign_metrics(vendor_df)
         
         # Sort by ROAS
-        campaign_sorted = get_campaign_performance(campaign_metrics, sort_by='ROAS', ascending=False)
+        campaign_sorted = cached_campaign_performance(campaign_metrics, sort_by='ROAS', ascending=False)
         
         if not campaign_sorted.empty:
             # Create a bar chart of top campaigns by ROAS
-            top_campaigns = campaign_sorted.head(10)
-            
-            # Find vendor/campaign column
-            vendor_col = None
-            for col in ['vendor', 'Vendor', 'Campaign', 'campaign']:
-                if col in top_campaigns.columns:
-                    vendor_col = col
-                    break
-            
-            if vendor_col and 'ROAS' in top_campaigns.columns:
-                # Filter out campaigns with 0 ROAS
+            if 'vendor' in campaign_metrics.columns and 'ROAS' in campaign_metrics.columns:
+                # Select the top 10 without sorting, then filter out campaigns with 0 ROAS
+                top_campaigns = campaign_metrics.nlargest(10, 'ROAS')
                 top_campaigns = top_campaigns[top_campaigns['ROAS'] > 0]
                 if not top_campaigns.empty:
-                    fig = go.Figure()
-                    fig.add_trace(go.Bar(
-                        x=top_campaigns[vendor_col],
-                        y=top_campaigns['ROAS'],
-                        marker_color=['green' if x >= 2 else 'orange' if x >= 1 else 'red' 
-                                     for x in top_campaigns['ROAS']],
-                        text=[f"{x:.2f}x" for x in top_campaigns['ROAS']],
-                        textposition='outside'
-                    ))
-                    
-                    fig.update_layout(
-                        title="Top Campaigns by ROAS",
-                        xaxis_title="Campaign/Vendor",
-                        yaxis_title="ROAS",
-                        height=400,
-                        showlegend=False
+                    fig = roas_bar_figure(
+                        top_campaigns['vendor'].to_numpy(dtype=str),
+                        top_campaigns['ROAS'].to_numpy(dtype=np.float32)
                     )
-                    
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("No campaigns with positive ROAS in the selected period")
             
-            # Display detailed table with flexible column mapping
-            column_mappings = {
-                'vendor': ['vendor', 'Vendor', 'Campaign', 'campaign'],
-                'leads': ['leads', 'Leads', 'Paid Calls', 'paidCalls'],
-                'sales': ['sales', 'Sales', '# Unique Sales', 'uniqueSales'],
-                'revenue': ['revenue', 'Revenue', 'Total Revenue'],
-                'leadSpend': ['leadSpend', 'Lead Cost', 'Lead Spend', 'spend'],
-                'ROAS': ['ROAS', 'roas'],
-                'profit': ['profit', 'Profit', 'Net Profit']
-            }
-            
-            display_cols = []
-            display_names = []
-            
-            for desired_col, possible_names in column_mappings.items():
-                for col_name in possible_names:
-                    if col_name in campaign_sorted.columns:
-                        display_cols.append(col_name)
-                        if desired_col == 'vendor':
-                            display_names.append('Vendor')
-                        elif desired_col == 'leads':
-                            display_names.append('Leads')
-                        elif desired_col == 'sales':
-                            display_names.append('Sales')
-                        elif desired_col == 'revenue':
-                            display_names.append('Revenue')
-                        elif desired_col == 'leadSpend':
-                            display_names.append('Spend')
-                        elif desired_col == 'ROAS':
-                            display_names.append('ROAS')
-                        elif desired_col == 'profit':
-                            display_names.append('Profit')
-                        break
-            
-            if display_cols:
-                display_df = campaign_sorted[display_cols].copy()
-                display_df.columns = display_names
-                
-                # Format columns
-                for col in ['Revenue', 'Spend', 'Profit']:
-                    if col in display_df.columns:
-                        display_df[col] = display_df[col].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "$0")
-                if 'ROAS' in display_df.columns:
-                    display_df['ROAS'] = display_df['ROAS'].apply(lambda x: f"{x:.2f}x" if pd.notna(x) else "0.00x")
-                
-                st.dataframe(display_df, use_container_width=True, hide_index=True)
+            # Display detailed table
+            st.dataframe(campaign_table(campaign_sorted), use_container_width=True, hide_index=True)
         else:
             st.info("No campaign data available for analysis")
     else:
         st.info("No campaign data available for the selected period")
 
+# Create two columns for agent and campaign data
+left_col, right_col = st.columns(2)
+
+with left_col:
+    render_agent_performance(agent_df)
+
+with right_col:
+    render_campaign_performance(vendor_df)
+
 # Add a trends section
 st.markdown("---")
 st.markdown("### 📈 Trends Analysis")
 
 if not agency_df.empty:
-    # Find date column
-    date_col = None
-    for col in ['Date', 'date', 'DATE']:
-        if col in agency_df.columns:
-            date_col = col
-            break
-    
-    # Find revenue column
-    revenue_col = None
-    for col in ['Total Rev', 'revenue', 'Revenue', 'Total Revenue']:
-        if col in agency_df.columns:
-            revenue_col = col
-            break
-    
-    if date_col and revenue_col:
-        # Create daily revenue trend
-        agency_df[date_col] = pd.to_datetime(agency_df[date_col])
-        # Clean revenue column if it contains strings with commas
-        if agency_df[revenue_col].dtype == 'object':
-            agency_df[revenue_col] = agency_df[revenue_col].astype(str).str.replace(',', '').str.replace('$', '')
-        agency_df[revenue_col] = pd.to_numeric(agency_df[revenue_col], errors='coerce')
-        daily_revenue = agency_df.groupby(date_col)[revenue_col].sum().reset_index()
+    # Daily revenue trend, aggregated once per date range and agency
+    daily_revenue = load_daily_revenue(start_date, end_date, agency_filter)
+    if not daily_revenue.empty:
+        import plotly.express as px
         
         fig = px.line(
             daily_revenue, 
-            x=date_col, 
-            y=revenue_col,
+            x='Date', 
+            y='Total Rev',
             title="Daily Revenue Trend",
-            labels={revenue_col: 'Revenue ($)', date_col: 'Date'}
+            labels={'Total Rev': 'Revenue ($)'}
         )
         
         fig.update_traces(mode='lines+markers')
@@ -525,19 +450,23 @@ st.markdown("---")
 col1, col2, col3 = st.columns([1, 1, 4])
 
 with col1:
-    if st.button("📥 Export to CSV"):
-        # Combine all data for export
-        export_data = {
-            'Daily Agency Stats': agency_df,
-            'Agent Performance': agent_df,
-            'Campaign Performance': vendor_df
-        }
-        
-        # Create a timestamp for the filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # For now, just show a message
-        st.success(f"Export functionality coming soon! Data from {start_date} to {end_date}")
+    # Combine all data for export
+    export_data = {
+        'Daily Agency Stats': agency_df,
+        'Agent Performance': agent_df,
+        'Campaign Performance': vendor_df
+    }
+    
+    # Create a timestamp for the filename
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    st.download_button(
+        "📥 Export to CSV",
+        data=build_export_zip(export_data),
+        file_name=f"dashboard_export_{start_date}_{end_date}_{timestamp}.zip",
+        mime="application/zip",
+        on_click="ignore"
+    )
 
 with col2:
     if st.button("📧 Email Report"):
@@ -545,6 +474,4 @@ with col2:
 
 # Refresh button
 with col3:
-    if st.button("🔄 Refresh Data"):
-        st.cache_data.clear()
-        st.rerun()
\ No newline at end of file
+    refresh_data_button()
\ No newline at end of file
@@ -5,751 +5,901 @@ Reports page for ad hoc report generation and scheduling
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
+import numpy as np
+import time as time_module
 from datetime import datetime, date, timedelta, time
 from typing import Dict, List
 
 # Add the parent directory to sys.path to import utils
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.append(_root)
 
-from utils.google_sheets import get_sheet_data
+from utils.google_sheets import get_sheet_data, get_sheets_batch, get_agency_list
+from utils.google_sheets_fallback import get_sheet_data_with_fallback
 from utils.reports import ReportGenerator
 from utils.calculations import get_weekly_summary
-from utils.scheduler import report_scheduler
+from utils.scheduler import report_scheduler, ScheduledReport
 from utils.settings import settings_manager
 
 # Initialize report generator
 report_generator = ReportGenerator()
 
-def main():
-    st.set_page_config(page_title="Reports", page_icon="📋", layout="wide")
+# Selectbox option labels, built once instead of in a format_func per rerun
+REPORT_TYPES = {
+    'daily': 'Daily',
+    'weekly': 'Weekly',
+    'monthly': 'Monthly',
+    'agent_performance': 'Agent Performance',
+    'campaign_analysis': 'Campaign Analysis',
+    'executive_summary': 'Executive Summary'
+}
+SCHEDULE_TYPES = {
+    'daily_performance': 'Daily Performance',
+    'weekly_aggregated': 'Weekly Aggregated',
+    'monthly_comprehensive': 'Monthly Comprehensive',
+    'agent_performance': 'Agent Performance',
+    'campaign_analysis': 'Campaign Analysis',
+    'executive_summary': 'Executive Summary'
+}
+USER_ROLES = {
+    'agency_owner': 'Agency Owner',
+    'management': 'Management',
+    'admin': 'Admin'
+}
+
+# Preset report periods as (start, end) for a given today
+PERIOD_RANGES = {
+    'Today': lambda today: (today, today),
+    'Yesterday': lambda today: (today - timedelta(days=1), today - timedelta(days=1)),
+    'Last 7 Days': lambda today: (today - timedelta(days=7), today),
+    'Last 30 Days': lambda today: (today - timedelta(days=30), today),
+    'Current Week': lambda today: (today - timedelta(days=today.weekday()), today + timedelta(days=6 - today.weekday())),
+    'Current Month': lambda today: (today.replace(day=1), today)
+}
+
+# Rows per page in the User Management table
+USERS_PAGE_SIZE = 50
+
+# Sheet reads are cached so reruns from widget interactions don't go back to
+# Google Sheets; the sidebar "Refresh Data" button clears them
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_sheet_data(sheet_name: str, start_date=None, end_date=None) -> pd.DataFrame:
+    return get_sheet_data(sheet_name, start_date, end_date)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_weekly_summary(start_date, end_date) -> pd.DataFrame:
+    return get_weekly_summary(cached_sheet_data('Daily Agency Stats', start_date, end_date))
+
+
+@st.cache_data(ttl=600, show_spinner=False, max_entries=32)
+def cached_report(report_type: str, start_date, end_date, agency) -> str:
+    return report_generator.generate_report(
+        report_type,
+        start_date=start_date,
+        end_date=end_date,
+        agency=agency
+    )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_sheets_batch(sheet_names: tuple) -> Dict[str, pd.DataFrame]:
+    return get_sheets_batch(list(sheet_names))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_sheet_data_with_fallback(sheet_name: str) -> pd.DataFrame:
+    return get_sheet_data_with_fallback(sheet_name)
+
+def load_agencies() -> Dict[str, List[str]]:
+    """Load the agency list used by the sidebar filter
     
-    st.title("📋 Ad Hoc Reports & Scheduling")
-    st.markdown("Generate custom reports and manage automated scheduling")
+    The schedule form's list is added under 'schedule' by
+    load_schedule_agencies() the first time an agency owner schedule needs it.
     
-    # Sidebar for report configuration
-    with st.sidebar:
-        st.header("Report Configuration")
-        
-        # Report type selection
-        report_type = st.selectbox(
-            "Select Report Type",
-            options=[
-                "daily",
-                "weekly", 
-                "monthly",
-                "agent_performance",
-                "campaign_analysis",
-                "executive_summary"
-            ],
-            format_func=lambda x: x.replace('_', ' ').title()
-        )
+    Returns:
+        Dictionary with 'filter' (agencies in the agent data, which is what
+        reports filter on)
+    """
+    try:
+        # Get agencies from agent data (which is what we actually filter on)
+        agent_data = cached_sheet_data_with_fallback('Daily Agent Totals')
+        
+        if not agent_data.empty and 'Agency' in agent_data.columns:
+            filter_agencies = sorted(agent_data['Agency'].dropna().unique().tolist())
+        else:
+            # Fallback to standard function if agent data not available
+            filter_agencies = get_agency_list()
+    except Exception:
+        filter_agencies = ["Bonavita Insurance", "Quality Insurance", "Quality Insurance Agency", "Your Health Group", "Fortified Insurance Solutions"]
+    
+    return {'filter': filter_agencies}
+
+
+def load_schedule_agencies() -> List[str]:
+    """Load the agencies offered for agency owner schedules
+    
+    Returns:
+        Sorted agency names from the agency stats, or an empty list
+    """
+    try:
+        agency_data = cached_sheet_data('Daily Agency Stats')
+        if not agency_data.empty and 'Agency' in agency_data.columns:
+            schedule_agencies = sorted(agency_data['Agency'].dropna().unique().tolist())
+        else:
+            schedule_agencies = []
+    except Exception:
+        schedule_agencies = []
+    
+    return schedule_agencies
+
+
+def render_report_tab(report_type: str, start_date, end_date, selected_agency: str, generate_report: bool):
+    """Render the generated report section
+    
+    Args:
+        report_type: Report type chosen in the sidebar
+        start_date: Start of the report period
+        end_date: End of the report period
+        selected_agency: Agency chosen in the sidebar, or "All Agencies"
+        generate_report: Whether the Generate Report button was clicked
+    """
+    st.header("Generated Report")
+    
+    if generate_report:
+        report_title = REPORT_TYPES.get(report_type, 'Unknown')
+        with st.spinner(f"Generating {report_title} report..."):
+            try:
+                # Generate the report with date and agency filtering
+                if report_type:
+                    # Keep the last report in session state so the email and
+                    # download widgets can rerun without regenerating it
+                    report_html = cached_report(
+                        report_type,
+                        start_date,
+                        end_date,
+                        selected_agency if selected_agency != "All Agencies" else None
+                    )
+                    # Encode once here rather than on every rerun of the download button
+                    st.session_state['last_report'] = {
+                        'report_type': report_type,
+                        'html': report_html,
+                        'bytes': report_html.encode('utf-8')
+                    }
+                else:
+                    st.error("Please select a report type")
+            except Exception as e:
+                st.error(f"Error generating report: {e}")
+    
+    last_report = st.session_state.get('last_report')
+    if last_report:
+        shown_type = last_report['report_type']
+        report_html = last_report['html']
         
-        # Date/Time period selection for ALL report types
-        st.subheader("📅 Date Selection")
+        # Display the report
+        components.html(report_html, height=800, scrolling=True)
         
-        if report_type == 'daily':
-            # For daily reports, select a specific date
-            report_date = st.date_input(
-                "Report Date", 
-                datetime.now().date(),
-                help="Select the specific date for the daily report"
-            )
-            start_date = end_date = report_date
-            
-        elif report_type in ['weekly', 'monthly']:
-            time_period = st.selectbox(
-                "Time Period",
-                options=['Current Period', 'Last 7 Days', 'Last 30 Days', 'Custom Range']
-            )
-            
-            if time_period == 'Custom Range':
-                start_date = st.date_input("Start Date", datetime.now() - timedelta(days=30))
-                end_date = st.date_input("End Date", datetime.now())
-            elif time_period == 'Last 7 Days':
-                end_date = datetime.now().date()
-                start_date = end_date - timedelta(days=7)
-            elif time_period == 'Last 30 Days':
-                end_date = datetime.now().date()
-                start_date = end_date - timedelta(days=30)
-            else:  # Current Period
-                if report_type == 'weekly':
-                    # Current week
-                    today = datetime.now().date()
-                    start_date = today - timedelta(days=today.weekday())
-                    end_date = start_date + timedelta(days=6)
-                else:  # monthly
-                    # Current month
-                    today = datetime.now().date()
-                    start_date = today.replace(day=1)
-                    end_date = today
-                    
-        else:  # agent_performance, campaign_analysis, executive_summary
-            time_period = st.selectbox(
-                "Analysis Period",
-                options=['Today', 'Yesterday', 'Last 7 Days', 'Last 30 Days', 'Custom Range']
-            )
-            
-            if time_period == 'Custom Range':
-                start_date = st.date_input("Start Date", datetime.now() - timedelta(days=7))
-                end_date = st.date_input("End Date", datetime.now())
-            elif time_period == 'Today':
-                start_date = end_date = datetime.now().date()
-            elif time_period == 'Yesterday':
-                start_date = end_date = datetime.now().date() - timedelta(days=1)
-            elif time_period == 'Last 7 Days':
-                end_date = datetime.now().date()
-                start_date = end_date - timedelta(days=7)
-            else:  # Last 30 Days
-                end_date = datetime.now().date()
-                start_date = end_date - timedelta(days=30)
+        # Always show email and download options when report is generated
+        st.markdown("---")
         
-        # Agency selection
-        st.subheader("🏢 Agency Filter")
-        try:
-            # Get agencies from agent data (which is what we actually filter on)
-            from utils.google_sheets_fallback import get_sheet_data_with_fallback
-            agent_data = get_sheet_data_with_fallback('Daily Agent Totals')
+        # Email section
+        st.subheader("📧 Email This Report")
+        
+        # Check email settings first
+        if not settings_manager.validate_email_settings():
+            st.error("❌ **Email settings not configured**")
+            st.markdown("""
+            **To email reports, configure your email settings:**
+            1. Go to the **⚙️ Settings** tab above
+            2. Fill in Gmail configuration and save
+            3. Test your settings
+            """)
+        else:
+            # Get available users
+            email_options = [user.email for user in settings_manager.get_report_recipients()]
             
-            if not agent_data.empty and 'Agency' in agent_data.columns:
-                agencies = sorted(agent_data['Agency'].dropna().unique().tolist())
-                agency_options = ["All Agencies"] + agencies
+            if not email_options:
+                st.error("❌ **No users configured**")
+                st.markdown("""
+                **To email reports, add users:**
+                1. Go to the **👥 User Management** tab above
+                2. Add users with email addresses
+                """)
             else:
-                # Fallback to standard function if agent data not available
-                from utils.google_sheets import get_agency_list
-                agencies = get_agency_list()
-                agency_options = ["All Agencies"] + agencies
-        except:
-            agency_options = ["All Agencies", "Bonavita Insurance", "Quality Insurance", "Quality Insurance Agency", "Your Health Group", "Fortified Insurance Solutions"]
-        
-        selected_agency = st.selectbox(
-            "Select Agency",
-            options=agency_options,
-            help="Filter report data by specific agency"
-        )
+                # Email form
+                with st.form("email_report_form", clear_on_submit=True):
+                    email_settings = settings_manager.email_settings
+                    st.info(f"📧 **Sending from:** {email_settings.sender_name} <{email_settings.sender_email}>")
+                    
+                    recipients = st.multiselect(
+                        "Select Recipients",
+                        options=email_options,
+                        default=email_options,
+                        help="Choose who should receive this report"
+                    )
+                    
+                    custom_subject = st.text_input(
+                        "Email Subject (Optional)",
+                        placeholder=f"{REPORT_TYPES.get(shown_type, 'Custom')} Report - {datetime.now().strftime('%Y-%m-%d')}",
+                        help="Leave blank to use default subject"
+                    )
+                    
+                    send_email = st.form_submit_button("📧 Send Email", type="primary", use_container_width=True)
+                    
+                    if send_email:
+                        if not recipients:
+                            st.error("❌ Please select at least one recipient")
+                        else:
+                            with st.spinner("Sending email..."):
+                                try:
+                                    # Create report for email sending
+                                    report_name = custom_subject or f"{REPORT_TYPES.get(shown_type, 'Custom')} Report"
+                                    mock_report = ScheduledReport(
+                                        id="adhoc",
+                                        name=report_name,
+                                        report_type=shown_type or "custom",
+                                        frequency="manual",
+                                        time="08:00",
+                                        recipients=recipients
+                                    )
+                                    
+                                    # Send the email
+                                    success = report_scheduler.email_service.send_report(mock_report, report_html)
+                                    
+                                    if success:
+                                        st.success(f"✅ **Email sent successfully!**")
+                                        st.balloons()
+                                        st.markdown(f"""
+                                        📧 **Details:**
+                                        - **Recipients:** {', '.join(recipients)}
+                                        - **Subject:** {mock_report.name}
+                                        - **Sent:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+                                        
+                                        Check recipients' inboxes (including spam folder).
+                                        """)
+                                    else:
+                                        st.error("❌ **Failed to send email**")
+                                        st.markdown("""
+                                        **Troubleshooting:**
+                                        - Verify email settings in ⚙️ Settings tab
+                                        - Test email settings first
+                                        - Check internet connection
+                                        """)
+                                
+                                except Exception as e:
+                                    st.error(f"❌ **Email error:** {str(e)}")
+                                    st.markdown("""
+                                    **This suggests a configuration issue:**
+                                    1. Go to ⚙️ Settings tab
+                                    2. Test your email settings
+                                    3. Verify Gmail app password is correct
+                                    """)
         
-        # Show selected parameters
         st.markdown("---")
-        st.markdown("**📋 Report Parameters:**")
-        st.write(f"**Type:** {report_type.replace('_', ' ').title() if report_type else 'None Selected'}")
-        st.write(f"**Date Range:** {start_date} to {end_date}")
-        st.write(f"**Agency:** {selected_agency}")
         
-        # Generate report button
-        generate_report = st.button("Generate Report", type="primary")
-    
-    # Main content area with tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Generated Report", "⚙️ Settings", "📅 Scheduling", "👥 User Management"])
-    
-    with tab1:
-        st.header("Generated Report")
+        # Download section
+        st.subheader("📥 Download Report")
+        st.download_button(
+            label="📥 Download HTML Report",
+            data=last_report['bytes'],
+            file_name=f"{shown_type}_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html",
+            mime="text/html",
+            use_container_width=True,
+            help="Download this report as an HTML file",
+            on_click="ignore"
+        )
+    else:
+        st.info("Select a report type and click 'Generate Report' to view the results.")
         
-        if generate_report:
-            report_title = report_type.replace('_', ' ').title() if report_type else 'Unknown'
-            with st.spinner(f"Generating {report_title} report..."):
-                try:
-                    # Generate the report with date and agency filtering
-                    if report_type:
-                        report_html = report_generator.generate_report(
-                            report_type,
-                            start_date=start_date,
-                            end_date=end_date,
-                            agency=selected_agency if selected_agency != "All Agencies" else None
-                        )
-                        
-                        # Display the report
-                        components.html(report_html, height=800, scrolling=True)
+        # Show sample data if available
+        try:
+            with st.expander("📊 Data Preview"):
+                # All three preview sheets come from one batchGet request
+                sheets = cached_sheets_batch(('Daily Agency Stats', 'Daily Agent Totals', 'Daily Lead Vendor Totals'))
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.subheader("Agency Stats")
+                    agency_data = sheets['Daily Agency Stats']
+                    if not agency_data.empty:
+                        st.dataframe(agency_data.head(), use_container_width=True)
                     else:
-                        st.error("Please select a report type")
-                    
-                    # Always show email and download options when report is generated
-                    st.markdown("---")
-                    
-                    # Email section
-                    st.subheader("📧 Email This Report")
-                    
-                    # Check email settings first
-                    if not settings_manager.validate_email_settings():
-                        st.error("❌ **Email settings not configured**")
-                        st.markdown("""
-                        **To email reports, configure your email settings:**
-                        1. Go to the **⚙️ Settings** tab above
-                        2. Fill in Gmail configuration and save
-                        3. Test your settings
-                        """)
+                        st.info("No agency data available")
+                
+                with col2:
+                    st.subheader("Agent Totals")
+                    agent_data = sheets['Daily Agent Totals']
+                    if not agent_data.empty:
+                        st.dataframe(agent_data.head(), use_container_width=True)
                     else:
-                        # Get available users
-                        agency_owners = settings_manager.get_agency_owners()
-                        management_team = settings_manager.get_management_team()
-                        all_users = agency_owners + management_team
-                        email_options = [user.email for user in all_users]
-                        
-                        if not email_options:
-                            st.error("❌ **No users configured**")
-                            st.markdown("""
-                            **To email reports, add users:**
-                            1. Go to the **👥 User Management** tab above
-                            2. Add users with email addresses
-                            """)
-                        else:
-                            # Email form
-                            with st.form("email_report_form", clear_on_submit=True):
-                                email_settings = settings_manager.email_settings
-                                st.info(f"📧 **Sending from:** {email_settings.sender_name} <{email_settings.sender_email}>")
-                                
-                                recipients = st.multiselect(
-                                    "Select Recipients",
-                                    options=email_options,
-                                    default=email_options,
-                                    help="Choose who should receive this report"
-                                )
-                                
-                                custom_subject = st.text_input(
-                                    "Email Subject (Optional)",
-                                    placeholder=f"{report_type.replace('_', ' ').title() if report_type else 'Custom'} Report - {datetime.now().strftime('%Y-%m-%d')}",
-                                    help="Leave blank to use default subject"
-                                )
-                                
-                                send_email = st.form_submit_button("📧 Send Email", type="primary", use_container_width=True)
-                                
-                                if send_email:
-                                    if not recipients:
-                                        st.error("❌ Please select at least one recipient")
-                                    else:
-                                        with st.spinner("Sending email..."):
-                                            try:
-                                                # Create report for email sending
-                                                from utils.scheduler import ScheduledReport
-                                                report_name = custom_subject or f"{report_type.replace('_', ' ').title() if report_type else 'Custom'} Report"
-                                                mock_report = ScheduledReport(
-                                                    id="adhoc",
-                                                    name=report_name,
-                                                    report_type=report_type or "custom",
-                                                    frequency="manual",
-                                                    time="08:00",
-                                                    recipients=recipients
-                                                )
-                                                
-                                                # Send the email
-                                                success = report_scheduler.email_service.send_report(mock_report, report_html)
-                                                
-                                                if success:
-                                                    st.success(f"✅ **Email sent successfully!**")
-                                                    st.balloons()
-                                                    st.markdown(f"""
-                                                    📧 **Details:**
-                                                    - **Recipients:** {', '.join(recipients)}
-                                                    - **Subject:** {mock_report.name}
-                                                    - **Sent:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-                                                    
-                                                    Check recipients' inboxes (including spam folder).
-                                                    """)
-                                                else:
-                                                    st.error("❌ **Failed to send email**")
-                                                    st.markdown("""
-                                                    **Troubleshooting:**
-                                                    - Verify email settings in ⚙️ Settings tab
-                                                    - Test email settings first
-                                                    - Check internet connection
-                                                    """)
-                                            
-                                            except Exception as e:
-                                                st.error(f"❌ **Email error:** {str(e)}")
-                                                st.markdown("""
-                                                **This suggests a configuration issue:**
-                                                1. Go to ⚙️ Settings tab
-                                                2. Test your email settings
-                                                3. Verify Gmail app password is correct
-                                                """)
-                    
-                    st.markdown("---")
-                    
-                    # Download section
-                    st.subheader("📥 Download Report")
-                    st.download_button(
-                        label="📥 Download HTML Report",
-                        data=report_html,
-                        file_name=f"{report_type}_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html",
-                        mime="text/html",
-                        use_container_width=True,
-                        help="Download this report as an HTML file"
-                    )
+                        st.info("No agent data available")
                 
+                with col3:
+                    st.subheader("Vendor Totals")
+                    vendor_data = sheets['Daily Lead Vendor Totals']
+                    if not vendor_data.empty:
+                        st.dataframe(vendor_data.head(), use_container_width=True)
+                    else:
+                        st.info("No vendor data available")
+                        
+            # Weekly aggregation demo
+            if st.checkbox("Show Weekly Aggregation"):
+                st.subheader("Weekly Data Aggregation")
+                try:
+                    weekly_data = cached_weekly_summary(start_date, end_date)
+                    if not weekly_data.empty:
+                        st.dataframe(weekly_data, use_container_width=True)
+                    else:
+                        st.info("Weekly aggregation requires data with Date column")
                 except Exception as e:
-                    st.error(f"Error generating report: {e}")
+                    st.error(f"Error creating weekly aggregation: {e}")
+                    
+        except Exception as e:
+            st.error(f"Error loading data preview: {e}")
+
+
+def render_settings_tab():
+    """Render the email and report settings section"""
+    st.header("Settings & Configuration")
+    
+    # Email settings
+    st.subheader("Email Configuration")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        email_sender = st.text_input(
+            "Sender Email", 
+            value=settings_manager.email_settings.sender_email,
+            help="Gmail address for sending reports"
+        )
+        sender_name = st.text_input(
+            "Sender Name",
+            value=settings_manager.email_settings.sender_name
+        )
+        smtp_server = st.text_input(
+            "SMTP Server",
+            value=settings_manager.email_settings.smtp_server
+        )
+    
+    with col2:
+        email_password = st.text_input(
+            "App Password", 
+            type="password",
+            help="Gmail app password (not your regular password)"
+        )
+        smtp_port = st.number_input(
+            "SMTP Port",
+            value=settings_manager.email_settings.smtp_port,
+            min_value=1,
+            max_value=65535
+        )
+        use_tls = st.checkbox(
+            "Use TLS",
+            value=settings_manager.email_settings.use_tls
+        )
+    
+    if st.button("Save Email Settings"):
+        success = settings_manager.update_email_settings(
+            sender_email=email_sender,
+            sender_password=email_password,
+            sender_name=sender_name,
+            smtp_server=smtp_server,
+            smtp_port=smtp_port,
+            use_tls=use_tls
+        )
+        if success:
+            st.success("Email settings saved successfully!")
         else:
-            st.info("Select a report type and click 'Generate Report' to view the results.")
+            st.error("Error saving email settings")
+    
+    if st.button("Test Email Settings"):
+        if settings_manager.validate_email_settings():
+            success = report_scheduler.test_email_settings()
+            if success:
+                st.success("Test email sent successfully!")
+            else:
+                st.error("Failed to send test email")
+        else:
+            st.error("Email settings are incomplete")
+    
+    # Report settings
+    st.subheader("Report Configuration")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        currency_symbol = st.text_input(
+            "Currency Symbol",
+            value=settings_manager.report_settings.currency_symbol,
+            max_chars=3
+        )
+    
+    with col2:
+        profitability_threshold = st.number_input(
+            "Profitability Threshold ($)",
+            value=settings_manager.report_settings.profitability_threshold,
+            min_value=0.0,
+            step=10.0
+        )
+        include_charts = st.checkbox(
+            "Include Charts in Reports",
+            value=settings_manager.report_settings.include_charts
+        )
+    
+    if st.button("Save Report Settings"):
+        success = settings_manager.update_report_settings(
+            profitability_threshold=profitability_threshold,
+            currency_symbol=currency_symbol,
+            include_charts=include_charts
+        )
+        if success:
+            st.success("Report settings saved successfully!")
+        else:
+            st.error("Error saving report settings")
+
+
+@st.fragment
+def render_scheduler_controls():
+    """Render the scheduler status metrics and start/stop buttons
+    
+    Runs as a fragment so starting or stopping the scheduler only reruns
+    this block.
+    """
+    # Scheduler status
+    scheduler_summary = report_scheduler.get_schedule_summary()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Reports", scheduler_summary['total_reports'])
+    with col2:
+        st.metric("Enabled Reports", scheduler_summary['enabled_reports'])
+    with col3:
+        st.metric("Due Reports", scheduler_summary['due_reports'])
+    with col4:
+        status_color = "🟢" if scheduler_summary['running'] else "🔴"
+        st.metric("Scheduler Status", f"{status_color} {'Running' if scheduler_summary['running'] else 'Stopped'}")
+    
+    # Scheduler controls
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("▶️ Start Scheduler"):
+            report_scheduler.start_scheduler()
+            st.success("Scheduler started!")
+            st.rerun(scope="fragment")
+    with col2:
+        if st.button("⏹️ Stop Scheduler"):
+            report_scheduler.stop_scheduler()
+            st.success("Scheduler stopped!")
+            st.rerun(scope="fragment")
+
+
+@st.fragment
+def render_scheduled_reports():
+    """Render the scheduled reports table and actions for the selected row
+    
+    Runs as a fragment so changing the table selection only reruns this
+    block; delete/toggle still rerun the page to refresh the status metrics.
+    """
+    # Existing scheduled reports
+    st.subheader("Scheduled Reports")
+    
+    if report_scheduler.scheduled_reports:
+        try:
+            # One table for all schedules instead of an expander per report
+            sched_df = pd.DataFrame.from_records(
+                vars(report) for report in report_scheduler.scheduled_reports
+            ).reindex(columns=['id', 'name', 'report_type', 'frequency', 'recipients', 'enabled', 'last_run', 'next_run'])
+            enabled_flags = sched_df['enabled'].fillna(True).astype(bool)
+            last_run = pd.to_datetime(sched_df['last_run'], errors='coerce', format='ISO8601')
+            next_run = pd.to_datetime(sched_df['next_run'], errors='coerce', format='ISO8601')
             
-            # Show sample data if available
-            try:
-                with st.expander("📊 Data Preview"):
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.subheader("Agency Stats")
-                        agency_data = get_sheet_data('Daily Agency Stats')
-                        if not agency_data.empty:
-                            st.dataframe(agency_data.head(), use_container_width=True)
-                        else:
-                            st.info("No agency data available")
-                    
-                    with col2:
-                        st.subheader("Agent Totals")
-                        agent_data = get_sheet_data('Daily Agent Totals')
-                        if not agent_data.empty:
-                            st.dataframe(agent_data.head(), use_container_width=True)
-                        else:
-                            st.info("No agent data available")
-                    
-                    with col3:
-                        st.subheader("Vendor Totals")
-                        vendor_data = get_sheet_data('Daily Lead Vendor Totals')
-                        if not vendor_data.empty:
-                            st.dataframe(vendor_data.head(), use_container_width=True)
-                        else:
-                            st.info("No vendor data available")
-                            
-                # Weekly aggregation demo
-                if st.checkbox("Show Weekly Aggregation"):
-                    st.subheader("Weekly Data Aggregation")
-                    try:
-                        agency_data = get_sheet_data('Daily Agency Stats')
-                        if not agency_data.empty and 'Date' in agency_data.columns:
-                            weekly_data = get_weekly_summary(agency_data)
-                            st.dataframe(weekly_data, use_container_width=True)
-                        else:
-                            st.info("Weekly aggregation requires data with Date column")
-                    except Exception as e:
-                        st.error(f"Error creating weekly aggregation: {e}")
-                        
-            except Exception as e:
-                st.error(f"Error loading data preview: {e}")
+            schedule_table = pd.DataFrame({
+                'Name': sched_df['name'].fillna('Unknown Report'),
+                'Type': sched_df['report_type'].fillna('unknown').str.replace('_', ' ').str.title(),
+                'Frequency': sched_df['frequency'].fillna('unknown'),
+                'Recipients': sched_df['recipients'].map(lambda r: ', '.join(r) if isinstance(r, list) and r else 'None'),
+                'Status': np.where(enabled_flags, '✅ Enabled', '❌ Disabled'),
+                'Last Run': last_run.dt.strftime('%Y-%m-%d %H:%M').fillna('Not yet executed'),
+                'Next Run': next_run.dt.strftime('%Y-%m-%d %H:%M').fillna(sched_df['next_run']).fillna('-')
+            })
+            
+            selection = st.dataframe(
+                schedule_table,
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                key="scheduled_reports_table"
+            )
+            
+            # Actions only for the selected report
+            selected_rows = [row for row in selection.selection.rows if row < len(sched_df)]
+            if selected_rows:
+                row = selected_rows[0]
+                report_id = sched_df['id'].iloc[row]
+                enabled = bool(enabled_flags.iloc[row])
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button(f"🗑️ Delete {schedule_table['Name'].iloc[row]}", key=f"delete_{report_id}"):
+                        if report_scheduler.remove_scheduled_report(report_id):
+                            st.session_state.pop('scheduled_reports_table', None)
+                            st.success("Report deleted!")
+                            st.rerun()
+                
+                with col2:
+                    enable_disable = "Disable" if enabled else "Enable"
+                    if st.button(f"⚡ {enable_disable}", key=f"toggle_{report_id}"):
+                        if report_scheduler.update_scheduled_report(report_id, enabled=not enabled):
+                            st.success(f"Report {enable_disable.lower()}d!")
+                            st.rerun()
+            else:
+                st.caption("Select a report in the table to delete or enable/disable it.")
+        
+        except Exception as e:
+            st.error(f"Error displaying scheduled reports: {str(e)}")
+            st.write("Report data might be corrupted. Consider deleting and recreating.")
+    else:
+        st.info("No reports scheduled yet.")
+
+
+def render_scheduling_tab(agencies: Dict[str, List[str]]):
+    """Render the report scheduling section
+    
+    Args:
+        agencies: Agency lists from load_agencies()
+    """
+    st.header("Report Scheduling")
     
-    with tab2:
-        st.header("Settings & Configuration")
+    # GitHub Sync Status (Optional)
+    try:
+        from utils.github_sync import github_sync
         
-        # Email settings
-        st.subheader("Email Configuration")
-        col1, col2 = st.columns(2)
+        with st.expander("🔗 GitHub Sync Status (Optional)", expanded=False):
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                if github_sync.is_configured():
+                    is_connected, message = github_sync.test_connection()
+                    if is_connected:
+                        st.success(f"Connected - {message}")
+                    else:
+                        st.error(f"Connection failed: {message}")
+                else:
+                    st.info("GitHub sync allows automatic synchronization between Streamlit and GitHub Actions.")
+                    st.info("See GITHUB_TOKEN_SETUP.md for setup instructions")
+            
+            with col2:
+                if st.button("🔄 Test Connection"):
+                    if github_sync.is_configured():
+                        is_connected, message = github_sync.test_connection()
+                        if is_connected:
+                            st.success("✅ Connection successful!")
+                        else:
+                            st.error(f"❌ {message}")
+                    else:
+                        st.error("❌ GitHub token not configured")
+    except ImportError:
+        st.info("📝 GitHub sync module not available (this is normal)")
+    except Exception as e:
+        st.warning(f"GitHub sync temporarily unavailable: {e}")
+    
+    st.divider()
+    
+    render_scheduler_controls()
+    
+    st.divider()
+    
+    # Add new scheduled report
+    st.subheader("Schedule New Report")
+    
+    with st.form("schedule_report_form"):
+        col1, col2, col3 = st.columns(3)
         
         with col1:
-            email_sender = st.text_input(
-                "Sender Email", 
-                value=settings_manager.email_settings.sender_email,
-                help="Gmail address for sending reports"
-            )
-            sender_name = st.text_input(
-                "Sender Name",
-                value=settings_manager.email_settings.sender_name
+            schedule_name = st.text_input("Report Name", placeholder="Daily Agency Report")
+            schedule_type = st.selectbox(
+                "Report Type",
+                options=list(SCHEDULE_TYPES),
+                format_func=SCHEDULE_TYPES.get
             )
-            smtp_server = st.text_input(
-                "SMTP Server",
-                value=settings_manager.email_settings.smtp_server
+            frequency = st.selectbox("Frequency", options=["daily", "weekly", "monthly"])
+            
+            # Time selection
+            report_time = st.time_input(
+                "Report Time",
+                value=time(8, 0),
+                help="When to send the report (your local time)"
             )
         
         with col2:
-            email_password = st.text_input(
-                "App Password", 
-                type="password",
-                help="Gmail app password (not your regular password)"
+            # User role selection
+            user_role = st.selectbox(
+                "User Role",
+                options=list(USER_ROLES),
+                format_func=USER_ROLES.get,
+                help="Determines data access level"
             )
-            smtp_port = st.number_input(
-                "SMTP Port",
-                value=settings_manager.email_settings.smtp_port,
-                min_value=1,
-                max_value=65535
-            )
-            use_tls = st.checkbox(
-                "Use TLS",
-                value=settings_manager.email_settings.use_tls
-            )
-        
-        if st.button("Save Email Settings"):
-            success = settings_manager.update_email_settings(
-                sender_email=email_sender,
-                sender_password=email_password,
-                sender_name=sender_name,
-                smtp_server=smtp_server,
-                smtp_port=smtp_port,
-                use_tls=use_tls
-            )
-            if success:
-                st.success("Email settings saved successfully!")
-            else:
-                st.error("Error saving email settings")
-        
-        if st.button("Test Email Settings"):
-            if settings_manager.validate_email_settings():
-                success = report_scheduler.test_email_settings()
-                if success:
-                    st.success("Test email sent successfully!")
+            
+            # Agency filter for agency owners
+            agency_filter = None
+            if user_role == "agency_owner":
+                # Only agency owner schedules need the agency list, so it is
+                # fetched on first use and then kept for the session
+                if 'schedule' not in agencies:
+                    agencies['schedule'] = load_schedule_agencies()
+                if agencies['schedule']:
+                    agency_filter = st.selectbox(
+                        "Agency",
+                        options=agencies['schedule'],
+                        help="Select the specific agency for this report"
+                    )
                 else:
-                    st.error("Failed to send test email")
+                    agency_filter = st.text_input(
+                        "Agency Name",
+                        help="Enter the agency name for filtering"
+                    )
             else:
-                st.error("Email settings are incomplete")
+                st.info("Management and Admin users see all agencies")
+            
+            # Campaign data inclusion
+            include_campaigns = st.checkbox(
+                "Include Campaign Data",
+                value=(user_role in ["management", "admin"]),
+                disabled=(user_role == "agency_owner"),
+                help="Campaign data only available for Management and Admin roles"
+            )
         
-        # Report settings
-        st.subheader("Report Configuration")
+        with col3:
+            # Get available email addresses
+            email_options = [user.email for user in settings_manager.get_report_recipients()]
+            
+            if email_options:
+                selected_emails = st.multiselect(
+                    "Recipients",
+                    options=email_options,
+                    help="Select users to receive this report"
+                )
+            else:
+                st.warning("No users configured. Add users in the User Management tab.")
+                selected_emails = []
+            
+            enabled = st.checkbox("Enable Report", value=True)
+            
+            # Show preview of report schedule
+            if frequency == "daily" and report_time:
+                st.info(f"📅 Will run daily at {report_time.strftime('%H:%M')} with yesterday's data")
+            elif frequency == "weekly" and report_time:
+                st.info(f"📅 Will run weekly on Mondays at {report_time.strftime('%H:%M')} with previous week's data (Sun-Sat)")
+            elif frequency == "monthly" and report_time:
+                st.info(f"📅 Will run monthly on the 1st at {report_time.strftime('%H:%M')} with previous month's data")
+        
+        submitted = st.form_submit_button("Schedule Report")
+        
+        if submitted and schedule_name and selected_emails and schedule_type and frequency and report_time:
+            report_id = report_scheduler.add_scheduled_report(
+                name=schedule_name,
+                report_type=schedule_type,
+                frequency=frequency,
+                time=report_time.strftime('%H:%M'),
+                recipients=selected_emails,
+                user_role=user_role,
+                agency_filter=agency_filter,
+                include_campaigns=include_campaigns
+            )
+            st.success(f"Report scheduled successfully! ID: {report_id}")
+            st.rerun()
+    
+    render_scheduled_reports()
+
+
+def render_users_tab():
+    """Render the user management section"""
+    st.header("User Management")
+    
+    # User summary
+    user_summary = settings_manager.get_settings_summary()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Users", user_summary['total_users'])
+    with col2:
+        st.metric("Agency Owners", user_summary['agency_owners'])
+    with col3:
+        st.metric("Management Team", user_summary['management_team'])
+    
+    # Add new user
+    st.subheader("Add New User")
+    
+    with st.form("add_user_form"):
         col1, col2 = st.columns(2)
         
         with col1:
-            currency_symbol = st.text_input(
-                "Currency Symbol",
-                value=settings_manager.report_settings.currency_symbol,
-                max_chars=3
-            )
+            user_name = st.text_input("Name", placeholder="John Doe")
+            user_email = st.text_input("Email", placeholder="john@example.com")
+            user_phone = st.text_input("Phone (Optional)", placeholder="+1234567890")
         
         with col2:
-            profitability_threshold = st.number_input(
-                "Profitability Threshold ($)",
-                value=settings_manager.report_settings.profitability_threshold,
-                min_value=0.0,
-                step=10.0
+            user_role = st.selectbox(
+                "Role",
+                options=list(USER_ROLES),
+                format_func=USER_ROLES.get
             )
-            include_charts = st.checkbox(
-                "Include Charts in Reports",
-                value=settings_manager.report_settings.include_charts
-            )
-        
-        if st.button("Save Report Settings"):
-            success = settings_manager.update_report_settings(
-                profitability_threshold=profitability_threshold,
-                currency_symbol=currency_symbol,
-                include_charts=include_charts
+            user_agency = st.text_input("Agency (Optional)", placeholder="ABC Insurance")
+            notifications = st.checkbox("Enable Notifications", value=True)
+        
+        submitted = st.form_submit_button("Add User")
+        
+        if submitted and user_name and user_email:
+            success = settings_manager.add_user(
+                name=user_name,
+                email=user_email,
+                role=user_role,
+                phone=user_phone if user_phone else None,
+                agency=user_agency if user_agency else None
             )
             if success:
-                st.success("Report settings saved successfully!")
+                st.success("User added successfully!")
+                st.rerun()
             else:
-                st.error("Error saving report settings")
+                st.error("Email already exists!")
     
-    with tab3:
-        st.header("Report Scheduling")
-        
-        # GitHub Sync Status (Optional)
-        try:
-            from utils.github_sync import github_sync
-            
-            with st.expander("🔗 GitHub Sync Status (Optional)", expanded=False):
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    if github_sync.is_configured():
-                        is_connected, message = github_sync.test_connection()
-                        if is_connected:
-                            st.success(f"Connected - {message}")
-                        else:
-                            st.error(f"Connection failed: {message}")
-                    else:
-                        st.info("GitHub sync allows automatic synchronization between Streamlit and GitHub Actions.")
-                        st.info("See GITHUB_TOKEN_SETUP.md for setup instructions")
-                
-                with col2:
-                    if st.button("🔄 Test Connection"):
-                        if github_sync.is_configured():
-                            is_connected, message = github_sync.test_connection()
-                            if is_connected:
-                                st.success("✅ Connection successful!")
-                            else:
-                                st.error(f"❌ {message}")
-                        else:
-                            st.error("❌ GitHub token not configured")
-        except ImportError:
-            st.info("📝 GitHub sync module not available (this is normal)")
-        except Exception as e:
-            st.warning(f"GitHub sync temporarily unavailable: {e}")
-        
-        st.divider()
-        
-        # Scheduler status
-        scheduler_summary = report_scheduler.get_schedule_summary()
-        
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Total Reports", scheduler_summary['total_reports'])
-        with col2:
-            st.metric("Enabled Reports", scheduler_summary['enabled_reports'])
-        with col3:
-            st.metric("Due Reports", scheduler_summary['due_reports'])
-        with col4:
-            status_color = "🟢" if scheduler_summary['running'] else "🔴"
-            st.metric("Scheduler Status", f"{status_color} {'Running' if scheduler_summary['running'] else 'Stopped'}")
+    # Existing users
+    st.subheader("Existing Users")
+    
+    if settings_manager.users:
+        # Only the current page of users is turned into a table and sent to the browser
+        page_count = (len(settings_manager.users) - 1) // USERS_PAGE_SIZE + 1
+        page = 1
+        if page_count > 1:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+        page_users = settings_manager.users[(page - 1) * USERS_PAGE_SIZE:page * USERS_PAGE_SIZE]
+        
+        # Build the table column-wise from the user records
+        users_df = pd.DataFrame.from_records(vars(user) for user in page_users)
+        users_df['role'] = users_df['role'].str.replace('_', ' ').str.title()
+        users_df['agency'] = users_df['agency'].replace('', None).fillna('-')
+        users_df['notifications_enabled'] = np.where(users_df['notifications_enabled'], '✅', '❌')
+        users_df['created_at'] = pd.to_datetime(users_df['created_at'], errors='coerce', format='ISO8601').dt.strftime('%Y-%m-%d').fillna('-')
+        users_df = users_df[['name', 'email', 'role', 'agency', 'notifications_enabled', 'created_at']].rename(columns={
+            'name': 'Name',
+            'email': 'Email',
+            'role': 'Role',
+            'agency': 'Agency',
+            'notifications_enabled': 'Notifications',
+            'created_at': 'Created'
+        })
+        st.dataframe(users_df, use_container_width=True)
+        
+        # User management actions
+        st.subheader("User Actions")
+        email_to_label = {user.email: f"{user.name} ({user.email})" for user in page_users}
+        selected_email = st.selectbox(
+            "Select User",
+            options=list(email_to_label),
+            format_func=email_to_label.get
+        )
         
-        # Scheduler controls
         col1, col2 = st.columns(2)
         with col1:
-            if st.button("▶️ Start Scheduler"):
-                report_scheduler.start_scheduler()
-                st.success("Scheduler started!")
-                st.rerun()
+            if st.button("🗑️ Remove User"):
+                if settings_manager.remove_user(selected_email):
+                    st.success("User removed successfully!")
+                    st.rerun()
+                else:
+                    st.error("Error removing user")
+        
         with col2:
-            if st.button("⏹️ Stop Scheduler"):
-                report_scheduler.stop_scheduler()
-                st.success("Scheduler stopped!")
-                st.rerun()
+            user = settings_manager.get_user(selected_email)
+            if user and st.button(f"{'🔕 Disable' if user.notifications_enabled else '🔔 Enable'} Notifications"):
+                if settings_manager.update_user(selected_email, notifications_enabled=not user.notifications_enabled):
+                    st.success("Notifications updated!")
+                    st.rerun()
+    else:
+        st.info("No users configured yet.")
+
+
+def main():
+    st.set_page_config(page_title="Reports", page_icon="📋", layout="wide")
+    
+    # Compute the agency lists once per session, refreshed every 5 minutes
+    if 'agencies' not in st.session_state or st.session_state.get('agencies_ts', 0) < time_module.time() - 300:
+        st.session_state['agencies'] = load_agencies()
+        st.session_state['agencies_ts'] = time_module.time()
+    agencies = st.session_state['agencies']
+    
+    st.title("📋 Ad Hoc Reports & Scheduling")
+    st.markdown("Generate custom reports and manage automated scheduling")
+    
+    # Sidebar for report configuration
+    with st.sidebar:
+        st.header("Report Configuration")
         
-        st.divider()
+        # Report type selection
+        report_type = st.selectbox(
+            "Select Report Type",
+            options=list(REPORT_TYPES),
+            format_func=REPORT_TYPES.get
+        )
         
-        # Add new scheduled report
-        st.subheader("Schedule New Report")
+        # Date/Time period selection for ALL report types
+        st.subheader("📅 Date Selection")
         
-        with st.form("schedule_report_form"):
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                schedule_name = st.text_input("Report Name", placeholder="Daily Agency Report")
-                schedule_type = st.selectbox(
-                    "Report Type",
-                    options=["daily_performance", "weekly_aggregated", "monthly_comprehensive", "agent_performance", "campaign_analysis", "executive_summary"],
-                    format_func=lambda x: x.replace('_', ' ').title()
-                )
-                frequency = st.selectbox("Frequency", options=["daily", "weekly", "monthly"])
-                
-                # Time selection
-                report_time = st.time_input(
-                    "Report Time",
-                    value=time(8, 0),
-                    help="When to send the report (your local time)"
-                )
+        today = date.today()
+        if report_type == 'daily':
+            # For daily reports, select a specific date
+            report_date = st.date_input(
+                "Report Date", 
+                today,
+                help="Select the specific date for the daily report"
+            )
+            start_date = end_date = report_date
             
-            with col2:
-                # User role selection
-                user_role = st.selectbox(
-                    "User Role",
-                    options=["agency_owner", "management", "admin"],
-                    format_func=lambda x: x.replace('_', ' ').title(),
-                    help="Determines data access level"
+        else:
+            if report_type in ['weekly', 'monthly']:
+                time_period = st.selectbox(
+                    "Time Period",
+                    options=['Current Period', 'Last 7 Days', 'Last 30 Days', 'Custom Range']
                 )
-                
-                # Agency filter for agency owners
-                agency_filter = None
-                if user_role == "agency_owner":
-                    # Get available agencies from the data
-                    try:
-                        agency_data = get_sheet_data('Daily Agency Stats')
-                        if not agency_data.empty and 'Agency' in agency_data.columns:
-                            agencies = sorted(agency_data['Agency'].dropna().unique())
-                            agency_filter = st.selectbox(
-                                "Agency",
-                                options=agencies,
-                                help="Select the specific agency for this report"
-                            )
-                        else:
-                            agency_filter = st.text_input(
-                                "Agency Name",
-                                help="Enter the agency name for filtering"
-                            )
-                    except:
-                        agency_filter = st.text_input(
-                            "Agency Name",
-                            help="Enter the agency name for filtering"
-                        )
-                else:
-                    st.info("Management and Admin users see all agencies")
-                
-                # Campaign data inclusion
-                include_campaigns = st.checkbox(
-                    "Include Campaign Data",
-                    value=(user_role in ["management", "admin"]),
-                    disabled=(user_role == "agency_owner"),
-                    help="Campaign data only available for Management and Admin roles"
+                custom_days = 30
+            else:  # agent_performance, campaign_analysis, executive_summary
+                time_period = st.selectbox(
+                    "Analysis Period",
+                    options=['Today', 'Yesterday', 'Last 7 Days', 'Last 30 Days', 'Custom Range']
                 )
+                custom_days = 7
             
-            with col3:
-                # Get available email addresses
-                agency_owners = settings_manager.get_agency_owners()
-                management_team = settings_manager.get_management_team()
-                
-                all_users = agency_owners + management_team
-                email_options = [user.email for user in all_users]
-                
-                if email_options:
-                    selected_emails = st.multiselect(
-                        "Recipients",
-                        options=email_options,
-                        help="Select users to receive this report"
-                    )
-                else:
-                    st.warning("No users configured. Add users in the User Management tab.")
-                    selected_emails = []
-                
-                enabled = st.checkbox("Enable Report", value=True)
-                
-                # Show preview of report schedule
-                if frequency == "daily" and report_time:
-                    st.info(f"📅 Will run daily at {report_time.strftime('%H:%M')} with yesterday's data")
-                elif frequency == "weekly" and report_time:
-                    st.info(f"📅 Will run weekly on Mondays at {report_time.strftime('%H:%M')} with previous week's data (Sun-Sat)")
-                elif frequency == "monthly" and report_time:
-                    st.info(f"📅 Will run monthly on the 1st at {report_time.strftime('%H:%M')} with previous month's data")
-            
-            submitted = st.form_submit_button("Schedule Report")
-            
-            if submitted and schedule_name and selected_emails and schedule_type and frequency and report_time:
-                report_id = report_scheduler.add_scheduled_report(
-                    name=schedule_name,
-                    report_type=schedule_type,
-                    frequency=frequency,
-                    time=report_time.strftime('%H:%M'),
-                    recipients=selected_emails,
-                    user_role=user_role,
-                    agency_filter=agency_filter,
-                    include_campaigns=include_campaigns
-                )
-                st.success(f"Report scheduled successfully! ID: {report_id}")
-                st.rerun()
-        
-        # Existing scheduled reports
-        st.subheader("Scheduled Reports")
-        
-        if report_scheduler.scheduled_reports:
-            for report in report_scheduler.scheduled_reports:
-                try:
-                    # Safe access to report attributes with error handling
-                    report_name = getattr(report, 'name', 'Unknown Report')
-                    report_frequency = getattr(report, 'frequency', 'unknown')
-                    report_type = getattr(report, 'report_type', 'unknown')
-                    recipients = getattr(report, 'recipients', [])
-                    enabled = getattr(report, 'enabled', True)
-                    next_run = getattr(report, 'next_run', None)
-                    report_id = getattr(report, 'id', f'report_{hash(str(report))}')
-                    
-                    with st.expander(f"📊 {report_name} ({report_frequency})"):
-                        col1, col2, col3 = st.columns([2, 2, 1])
-                        
-                        with col1:
-                            st.write(f"**Type:** {report_type.replace('_', ' ').title()}")
-                            st.write(f"**Recipients:** {', '.join(recipients) if recipients else 'None'}")
-                            st.write(f"**Status:** {'✅ Enabled' if enabled else '❌ Disabled'}")
-                        
-                        with col2:
-                            # Safe handling of last_run - check if it exists but don't fail if it doesn't
-                            try:
-                                if hasattr(report, 'last_run') and getattr(report, 'last_run', None):
-                                    last_run = datetime.fromisoformat(report.last_run)
-                                    st.write(f"**Last Run:** {last_run.strftime('%Y-%m-%d %H:%M')}")
-                                else:
-                                    st.write("**Last Run:** Not yet executed")
-                            except:
-                                st.write("**Last Run:** Not yet executed")
-                            
-                            if next_run:
-                                try:
-                                    next_run_dt = datetime.fromisoformat(next_run)
-                                    st.write(f"**Next Run:** {next_run_dt.strftime('%Y-%m-%d %H:%M')}")
-                                except:
-                                    st.write(f"**Next Run:** {next_run}")
-                        
-                        with col3:
-                            if st.button(f"🗑️ Delete", key=f"delete_{report_id}"):
-                                if report_scheduler.remove_scheduled_report(report_id):
-                                    st.success("Report deleted!")
-                                    st.rerun()
-                            
-                            enable_disable = "Disable" if enabled else "Enable"
-                            if st.button(f"⚡ {enable_disable}", key=f"toggle_{report_id}"):
-                                if report_scheduler.update_scheduled_report(report_id, enabled=not enabled):
-                                    st.success(f"Report {enable_disable.lower()}d!")
-                                    st.rerun()
-                
-                except Exception as e:
-                    st.error(f"Error displaying report: {str(e)}")
-                    st.write("Report data might be corrupted. Consider deleting and recreating.")
-        else:
-            st.info("No reports scheduled yet.")
-    
-    with tab4:
-        st.header("User Management")
-        
-        # User summary
-        user_summary = settings_manager.get_settings_summary()
+            if time_period == 'Custom Range':
+                start_date = st.date_input("Start Date", today - timedelta(days=custom_days))
+                end_date = st.date_input("End Date", today)
+            else:
+                if time_period == 'Current Period':
+                    # Current week for weekly reports, month to date for monthly
+                    time_period = 'Current Week' if report_type == 'weekly' else 'Current Month'
+                start_date, end_date = PERIOD_RANGES[time_period](today)
         
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Users", user_summary['total_users'])
-        with col2:
-            st.metric("Agency Owners", user_summary['agency_owners'])
-        with col3:
-            st.metric("Management Team", user_summary['management_team'])
+        # Agency selection
+        st.subheader("🏢 Agency Filter")
+        agency_options = ["All Agencies"] + agencies['filter']
         
-        # Add new user
-        st.subheader("Add New User")
+        selected_agency = st.selectbox(
+            "Select Agency",
+            options=agency_options,
+            help="Filter report data by specific agency"
+        )
         
-        with st.form("add_user_form"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                user_name = st.text_input("Name", placeholder="John Doe")
-                user_email = st.text_input("Email", placeholder="john@example.com")
-                user_phone = st.text_input("Phone (Optional)", placeholder="+1234567890")
-            
-            with col2:
-                user_role = st.selectbox(
-                    "Role",
-                    options=["agency_owner", "management", "admin"],
-                    format_func=lambda x: x.replace('_', ' ').title()
-                )
-                user_agency = st.text_input("Agency (Optional)", placeholder="ABC Insurance")
-                notifications = st.checkbox("Enable Notifications", value=True)
-            
-            submitted = st.form_submit_button("Add User")
-            
-            if submitted and user_name and user_email:
-                success = settings_manager.add_user(
-                    name=user_name,
-                    email=user_email,
-                    role=user_role,
-                    phone=user_phone if user_phone else None,
-                    agency=user_agency if user_agency else None
-                )
-                if success:
-                    st.success("User added successfully!")
-                    st.rerun()
-                else:
-                    st.error("Email already exists!")
+        # Show selected parameters
+        st.markdown("---")
+        st.markdown("**📋 Report Parameters:**")
+        st.write(f"**Type:** {REPORT_TYPES.get(report_type, 'None Selected')}")
+        st.write(f"**Date Range:** {start_date} to {end_date}")
+        st.write(f"**Agency:** {selected_agency}")
         
-        # Existing users
-        st.subheader("Existing Users")
+        # Generate report button
+        generate_report = st.button("Generate Report", type="primary")
         
-        if settings_manager.users:
-            users_data = []
-            for user in settings_manager.users:
-                users_data.append({
-                    'Name': user.name,
-                    'Email': user.email,
-                    'Role': user.role.replace('_', ' ').title(),
-                    'Agency': user.agency or '-',
-                    'Notifications': '✅' if user.notifications_enabled else '❌',
-                    'Created': datetime.fromisoformat(user.created_at).strftime('%Y-%m-%d') if user.created_at else '-'
-                })
-            
-            users_df = pd.DataFrame(users_data)
-            st.dataframe(users_df, use_container_width=True)
-            
-            # User management actions
-            st.subheader("User Actions")
-            selected_email = st.selectbox(
-                "Select User",
-                options=[user.email for user in settings_manager.users],
-                format_func=lambda email: f"{next(u.name for u in settings_manager.users if u.email == email)} ({email})"
-            )
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("🗑️ Remove User"):
-                    if settings_manager.remove_user(selected_email):
-                        st.success("User removed successfully!")
-                        st.rerun()
-                    else:
-                        st.error("Error removing user")
-            
-            with col2:
-                user = settings_manager.get_user(selected_email)
-                if user and st.button(f"{'🔕 Disable' if user.notifications_enabled else '🔔 Enable'} Notifications"):
-                    if settings_manager.update_user(selected_email, notifications_enabled=not user.notifications_enabled):
-                        st.success("Notifications updated!")
-                        st.rerun()
-        else:
-            st.info("No users configured yet.")
+        # Force a reload of the cached sheet data
+        if st.button("🔄 Refresh Data"):
+            st.cache_data.clear()
+            st.session_state.pop('agencies', None)
+            st.rerun()
+    
+    # Main content area - only the selected section is built on each rerun, unlike
+    # st.tabs which renders every tab's content up front
+    sections = ["📊 Generated Report", "⚙️ Settings", "📅 Scheduling", "👥 User Management"]
+    if generate_report:
+        st.session_state['reports_section'] = sections[0]
+    active = st.radio("Section", sections, horizontal=True, label_visibility='collapsed', key='reports_section')
+    
+    if active == sections[0]:
+        render_report_tab(report_type, start_date, end_date, selected_agency, generate_report)
+    elif active == sections[1]:
+        render_settings_tab()
+    elif active == sections[2]:
+        render_scheduling_tab(agencies)
+    else:
+        render_users_tab()
 
 # Removed show_email_dialog function - email interface is now integrated directly into the main report view
 
@@ -4,12 +4,17 @@ System Status page - Google Sheets connectivity and troubleshooting
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 import sys
 import os
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Add the parent directory to sys.path to import utils
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.append(_root)
 
 from utils.status_info import (
     show_google_sheets_status,
@@ -20,55 +25,96 @@ from utils.status_info import (
     check_google_services_status
 )
 
-def main():
-    st.set_page_config(page_title="System Status", page_icon="🔧", layout="wide")
-    
-    st.title("🔧 System Status & Troubleshooting")
-    st.markdown("Monitor Google Sheets connectivity and manage fallback data")
-    
-    # Main status banner
-    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
-    
-    with col1:
-        overall_status = check_google_services_status()
-        if overall_status == "✅ Online":
-            st.success("**System Status:** All services operational")
-        elif overall_status == "⚠️ Limited":
-            st.warning("**System Status:** Limited functionality (using cache)")
-        else:
-            st.error("**System Status:** Service disruption detected")
-    
-    with col2:
-        # Show scheduler status
-        try:
-            from utils.scheduler import report_scheduler
-            scheduler_status = report_scheduler.get_schedule_summary()
-            
-            if scheduler_status['running'] and scheduler_status['email_configured']:
-                st.success("**Scheduler:** ✅ Active")
-            elif scheduler_status['running']:
-                st.warning("**Scheduler:** ⚠️ Running (Email not configured)")
-            else:
-                st.error("**Scheduler:** ❌ Stopped")
-                
-        except Exception as e:
-            st.error("**Scheduler:** ❌ Error")
-    
-    with col3:
-        st.info(f"**Last Updated:** {datetime.now().strftime('%H:%M:%S')}")
-    
-    with col4:
-        if st.button("🔄 Refresh Status"):
-            st.rerun()
-    
-    st.markdown("---")
+# This page has to render even when a subsystem is broken, so a failed import
+# is recorded here and re-raised inside the section that needs it
+try:
+    from utils.google_sheets import get_sheet_data
+    from utils.google_sheets_fallback import (
+        get_sheets_with_fallback,
+        get_cache_info,
+        clear_cache
+    )
+    from utils.reports import report_generator
+    from utils.settings import settings_manager
+    from utils.scheduler import report_scheduler
+    IMPORT_ERROR = None
+except Exception as e:
+    IMPORT_ERROR = e
+
+
+# Sheets the dashboard reads, with a short description of each
+DATA_SOURCES = {
+    'Daily Agency Stats': 'Agency performance data',
+    'Daily Agent Totals': 'Individual agent metrics',
+    'Daily Lead Vendor Totals': 'Campaign and vendor data'
+}
+
+
+def require_utils():
+    """Raise the error from loading the utils modules, if there was one"""
+    if IMPORT_ERROR is not None:
+        raise IMPORT_ERROR
+
+# Status checks are cached so widget reruns don't repeat them; the scheduler
+# buttons clear the summary so state changes show up immediately
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_schedule_summary(schedules_file: str, schedules_mtime: float) -> dict:
+    return report_scheduler.get_schedule_summary()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_schedule_table(schedules_file: str, schedules_mtime: float) -> pd.DataFrame:
+    """Build the scheduled reports table, rebuilt only when the schedules file changes
+    
+    Every scheduler change is saved to the file, so its mtime is enough to
+    invalidate the table.
+    """
+    rows = [
+        (
+            report.name,
+            report.report_type.replace('_', ' ').title(),
+            report.frequency.title(),
+            report.next_run if report.next_run else "Not scheduled",
+            ", ".join(report.recipients),
+            "✅ Enabled" if report.enabled else "⏸️ Disabled"
+        )
+        for report in report_scheduler.scheduled_reports
+    ]
+    return pd.DataFrame.from_records(
+        rows, columns=["Report Name", "Type", "Frequency", "Next Run", "Recipients", "Status"]
+    )
+
+
+def schedule_summary() -> dict:
+    """Get the scheduler summary, recomputed whenever the schedules file changes"""
+    require_utils()
+    report_scheduler.reload_if_changed()
+    return cached_schedule_summary(report_scheduler.schedules_file, report_scheduler.schedules_mtime())
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def cached_google_services_status() -> str:
+    return check_google_services_status()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_sheets_with_fallback(sheet_names: tuple) -> dict:
+    require_utils()
+    return get_sheets_with_fallback(list(sheet_names))
+
+
+@st.fragment
+def render_scheduler_panel():
+    """Render the scheduler metrics, schedule table and controls
     
-    # Scheduler Status Section
+    Runs as a fragment so the scheduler buttons only rerun this panel, not
+    the data, cache and sheet tabs below it.
+    """
     st.subheader("📅 Automated Reports Scheduler")
     
     try:
-        from utils.scheduler import report_scheduler
-        scheduler_summary = report_scheduler.get_schedule_summary()
+        require_utils()
+        scheduler_summary = schedule_summary()
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -86,21 +132,11 @@ def main():
             st.metric("Scheduler Status", f"{status_color} {'Running' if scheduler_summary['running'] else 'Stopped'}")
         
         # Show scheduled reports
-        if len(report_scheduler.scheduled_reports) > 0:
+        if report_scheduler.scheduled_reports:
             st.subheader("📋 Scheduled Reports")
             
-            schedule_data = []
-            for report in report_scheduler.scheduled_reports:
-                schedule_data.append({
-                    "Report Name": report.name,
-                    "Type": report.report_type.replace('_', ' ').title(),
-                    "Frequency": report.frequency.title(),
-                    "Next Run": report.next_run if report.next_run else "Not scheduled",
-                    "Recipients": ", ".join(report.recipients),
-                    "Status": "✅ Enabled" if report.enabled else "⏸️ Disabled"
-                })
-            
-            df = pd.DataFrame(schedule_data)
+            # schedule_summary() above has already reloaded a changed file
+            df = cached_schedule_table(report_scheduler.schedules_file, report_scheduler.schedules_mtime())
             st.dataframe(df, use_container_width=True)
         else:
             st.info("No reports currently scheduled. Visit the Reports page to set up automated reports.")
@@ -113,13 +149,15 @@ def main():
             if not scheduler_summary['running']:
                 if st.button("▶️ Start Scheduler"):
                     report_scheduler.start_scheduler()
+                    cached_schedule_summary.clear()
                     st.success("Scheduler started!")
-                    st.rerun()
+                    st.rerun(scope="fragment")
             else:
                 if st.button("⏹️ Stop Scheduler"):
                     report_scheduler.stop_scheduler()
+                    cached_schedule_summary.clear()
                     st.success("Scheduler stopped!")
-                    st.rerun()
+                    st.rerun(scope="fragment")
         
         with col2:
             if st.button("📧 Test Email Settings"):
@@ -130,34 +168,85 @@ def main():
         
         with col3:
             if st.button("🔄 Reload Schedules"):
+                # Force a reload from disk, even if the file looks unchanged
                 report_scheduler.load_schedules()
+                cached_schedule_summary.clear()
                 st.success("Schedules reloaded!")
-                st.rerun()
+                st.rerun(scope="fragment")
                 
     except Exception as e:
         st.error(f"Error loading scheduler status: {e}")
+
+
+def main():
+    st.set_page_config(page_title="System Status", page_icon="🔧", layout="wide")
     
-    st.markdown("---")
+    st.title("🔧 System Status & Troubleshooting")
+    st.markdown("Monitor Google Sheets connectivity and manage fallback data")
     
-    # Tabs for different status sections
-    tab1, tab2, tab3, tab4 = st.tabs(["📋 Data Status", "🔧 Cache Management", "📊 Sheet Info", "🆘 Help"])
+    # Checked once per run and shared by the banner and the Sheet Info tab
+    overall_status = cached_google_services_status()
     
-    with tab1:
-        show_data_status_tab()
+    # Main status banner
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
     
-    with tab2:
-        show_cache_management_tab()
+    with col1:
+        if overall_status == "✅ Online":
+            st.success("**System Status:** All services operational")
+        elif overall_status == "⚠️ Limited":
+            st.warning("**System Status:** Limited functionality (using cache)")
+        else:
+            st.error("**System Status:** Service disruption detected")
+    
+    with col2:
+        # Show scheduler status
+        try:
+            scheduler_status = schedule_summary()
+            
+            if scheduler_status['running'] and scheduler_status['email_configured']:
+                st.success("**Scheduler:** ✅ Active")
+            elif scheduler_status['running']:
+                st.warning("**Scheduler:** ⚠️ Running (Email not configured)")
+            else:
+                st.error("**Scheduler:** ❌ Stopped")
+                
+        except Exception as e:
+            st.error("**Scheduler:** ❌ Error")
+    
+    with col3:
+        st.info(f"**Last Updated:** {datetime.now().strftime('%H:%M:%S')}")
+    
+    with col4:
+        if st.button("🔄 Refresh Status"):
+            cached_schedule_summary.clear()
+            cached_google_services_status.clear()
+            st.rerun()
+    
+    st.markdown("---")
+    
+    # Scheduler Status Section
+    render_scheduler_panel()
+    
+    st.markdown("---")
     
-    with tab3:
-        show_sheet_info_tab()
+    # Status sections - only the selected one is built on each rerun, unlike
+    # st.tabs which would read the sheets and cache for every tab up front
+    sections = ["📋 Data Status", "🔧 Cache Management", "📊 Sheet Info", "🆘 Help"]
+    active = st.radio("Section", sections, horizontal=True, label_visibility='collapsed', key='status_section')
     
-    with tab4:
+    if active == sections[0]:
+        show_data_status_tab()
+    elif active == sections[1]:
+        show_cache_management_tab()
+    elif active == sections[2]:
+        show_sheet_info_tab(overall_status)
+    else:
         show_help_tab()
 
 def test_google_sheets_connection():
     """Test the connection to Google Sheets"""
     try:
-        from utils.google_sheets import get_sheet_data
+        require_utils()
         
         # Try to read a small amount of data
         with st.spinner("Testing Google Sheets connection..."):
@@ -212,25 +301,25 @@ def show_data_status_tab():
     st.subheader("📋 Data Source Status")
     
     # Test each data source
-    data_sources = [
-        ('Daily Agency Stats', 'Agency performance data'),
-        ('Daily Agent Totals', 'Individual agent metrics'),
-        ('Daily Lead Vendor Totals', 'Campaign and vendor data')
-    ]
+    # Fetch all sheets in one batchGet request up front
+    try:
+        sheets = cached_sheets_with_fallback(tuple(DATA_SOURCES))
+    except Exception as e:
+        st.error(f"Error accessing data sources: {e}")
+        return
     
-    for sheet_name, description in data_sources:
+    for sheet_name, description in DATA_SOURCES.items():
         with st.expander(f"📊 {sheet_name}"):
             try:
-                # Try to get data from fallback system
-                from utils.google_sheets_fallback import get_sheet_data_with_fallback
-                df = get_sheet_data_with_fallback(sheet_name)
+                df = sheets[sheet_name]
                 
                 if not df.empty:
+                    row_count, column_count = df.shape
                     col1, col2, col3 = st.columns(3)
                     with col1:
-                        st.metric("Rows", len(df))
+                        st.metric("Rows", row_count)
                     with col2:
-                        st.metric("Columns", len(df.columns))
+                        st.metric("Columns", column_count)
                     with col3:
                         # Determine data source
                         if hasattr(df, '_cached_data'):
@@ -239,7 +328,7 @@ def show_data_status_tab():
                             st.metric("Source", "Sample/Live")
                     
                     st.write(f"**Description:** {description}")
-                    st.write(f"**Columns:** {', '.join(df.columns.tolist())}")
+                    st.write(f"**Columns:** {', '.join(map(str, df.columns))}")
                     
                     # Show preview
                     if st.checkbox(f"Show data preview", key=f"preview_{sheet_name}"):
@@ -256,7 +345,7 @@ def show_cache_management_tab():
     st.subheader("🔧 Cache Management")
     
     try:
-        from utils.google_sheets_fallback import get_cache_info, clear_cache
+        require_utils()
         
         cache_info = get_cache_info()
         
@@ -264,17 +353,14 @@ def show_cache_management_tab():
             st.success("📋 **Cached Data Available:**")
             
             # Display cache information in a table
-            cache_data = []
-            for sheet_name, info in cache_info.items():
-                cache_data.append({
-                    'Sheet Name': sheet_name,
-                    'Size (bytes)': info['size'],
-                    'Last Modified': info['modified'],
-                    'Age': calculate_cache_age(info['modified'])
-                })
+            cache_df = pd.DataFrame({
+                'Sheet Name': list(cache_info),
+                'Size (bytes)': [info['size'] for info in cache_info.values()],
+                'Last Modified': [info['modified'] for info in cache_info.values()]
+            })
+            cache_df['Age'] = cache_age_labels(cache_df['Last Modified'])
             
-            if cache_data:
-                cache_df = pd.DataFrame(cache_data)
+            if not cache_df.empty:
                 st.dataframe(cache_df, use_container_width=True)
                 
                 # Cache management actions
@@ -299,6 +385,27 @@ def show_cache_management_tab():
     except Exception as e:
         st.error(f"Error accessing cache system: {e}")
 
+def cache_age_labels(modified_times: pd.Series) -> pd.Series:
+    """Calculate how old cached data is for a column of ISO timestamps
+    
+    Column-wise version of calculate_cache_age with the same labels.
+    """
+    # Like the scalar version, any UTC offset is dropped and the wall time kept
+    wall_times = modified_times.str.replace(r'(Z|[+-]\d{2}:?\d{2})$', '', regex=True)
+    modified = pd.to_datetime(wall_times, errors='coerce', format='ISO8601')
+    seconds = (pd.Timestamp.now() - modified).dt.total_seconds()
+    whole = seconds.fillna(0).astype(int)
+    
+    labels = np.select(
+        [seconds >= 86400, seconds > 3600, seconds > 60, seconds.notna()],
+        [(whole // 86400).astype(str) + ' days',
+         (whole // 3600).astype(str) + ' hours',
+         (whole // 60).astype(str) + ' minutes',
+         '< 1 minute'],
+        default='Unknown'
+    )
+    return pd.Series(labels, index=modified_times.index)
+
 def calculate_cache_age(modified_time: str) -> str:
     """Calculate how old cached data is"""
     try:
@@ -328,21 +435,19 @@ def show_detailed_cache_info(cache_info):
             st.write(f"**Last Modified:** {info['modified']}")
             st.write(f"**Age:** {calculate_cache_age(info['modified'])}")
 
-def show_sheet_info_tab():
-    """Show Google Sheets information and configuration"""
+def show_sheet_info_tab(services_status: str):
+    """Show Google Sheets information and configuration
+    
+    Args:
+        services_status: Result of check_google_services_status for this run
+    """
     
     st.subheader("📊 Google Sheets Configuration")
     
     try:
         # Show spreadsheet info
         st.write("**Expected Sheet Names:**")
-        expected_sheets = [
-            "Daily Agency Stats",
-            "Daily Agent Totals", 
-            "Daily Lead Vendor Totals"
-        ]
-        
-        for sheet in expected_sheets:
+        for sheet in DATA_SOURCES:
             st.write(f"- {sheet}")
         
         # Connection test
@@ -359,10 +464,9 @@ def show_sheet_info_tab():
         # Service status
         st.subheader("🌐 Google Services Status")
         
-        status = check_google_services_status()
-        if status == "operational":
+        if services_status == "operational":
             st.success("🟢 Google Sheets API: Operational")
-        elif status == "issues":
+        elif services_status == "issues":
             st.warning("🟡 Google Sheets API: Experiencing issues")
         else:
             st.info("🔵 Google Sheets API: Status unknown")
@@ -381,6 +485,8 @@ def show_help_tab():
     
     with col1:
         if st.button("🔄 Retry Connection"):
+            # Drop the cached status so the rerun checks the connection again
+            cached_google_services_status.clear()
             st.rerun()
     
     with col2:
@@ -436,6 +542,46 @@ def show_help_tab():
         3. Ensure sheets exist in your spreadsheet
         """)
 
+def _test_fallback_data():
+    """System test: the Data Status tab's batched read returns data"""
+    test_data = cached_sheets_with_fallback(tuple(DATA_SOURCES))['Daily Agency Stats']
+    if not test_data.empty:
+        return "✅ Fallback Data", f"Sample data available ({len(test_data)} rows)"
+    return "⚠️ Fallback Data", "No sample data available"
+
+
+def _test_report_generation():
+    """System test: a daily report can be generated"""
+    report = report_generator.generate_daily_report()
+    if len(report) > 100:
+        return "✅ Report Generation", f"Report generated ({len(report)} chars)"
+    return "⚠️ Report Generation", "Report too short"
+
+
+def _test_settings():
+    """System test: settings load"""
+    summary = settings_manager.get_settings_summary()
+    return "✅ Settings System", f"Settings loaded ({summary['total_users']} users)"
+
+
+def _test_scheduler():
+    """System test: the scheduler loads its schedules"""
+    scheduler_summary = report_scheduler.get_schedule_summary()
+    return "✅ Scheduler System", f"Scheduler loaded ({scheduler_summary['total_reports']} reports)"
+
+
+# Independent system tests, run side by side after the import check
+SYSTEM_TESTS = {
+    "Fallback Data": _test_fallback_data,
+    "Report Generation": _test_report_generation,
+    "Settings System": _test_settings,
+    "Scheduler System": _test_scheduler
+}
+
+# Seconds to wait for the system tests before reporting the rest as timed out
+SYSTEM_TEST_TIMEOUT = 15
+
+
 def run_system_tests():
     """Run comprehensive system tests"""
     
@@ -445,49 +591,30 @@ def run_system_tests():
         
         tests = []
         
-        # Test 1: Import modules
+        # Test 1: Import modules - the other tests need them
         try:
-            from utils.google_sheets_fallback import get_sheet_data_with_fallback
-            from utils.reports import report_generator
-            from utils.settings import settings_manager
-            from utils.scheduler import report_scheduler
+            require_utils()
             tests.append(("✅ Module Imports", "All modules imported successfully"))
         except Exception as e:
             tests.append(("❌ Module Imports", f"Import error: {e}"))
         
-        # Test 2: Fallback data
-        try:
-            test_data = get_sheet_data_with_fallback('Daily Agency Stats')
-            if not test_data.empty:
-                tests.append(("✅ Fallback Data", f"Sample data available ({len(test_data)} rows)"))
-            else:
-                tests.append(("⚠️ Fallback Data", "No sample data available"))
-        except Exception as e:
-            tests.append(("❌ Fallback Data", f"Error: {e}"))
+        # Tests 2-5 are independent, so the check takes as long as the slowest one.
+        # The pool is not waited on at exit so a stalled Sheets call can't hang the page.
+        # Workers get this run's context so cached reads and their warnings still work
+        executor = ThreadPoolExecutor(max_workers=len(SYSTEM_TESTS), initializer=add_script_run_ctx,
+                                      initargs=(None, get_script_run_ctx()))
+        futures = {executor.submit(test): name for name, test in SYSTEM_TESTS.items()}
+        done, _ = wait(futures, timeout=SYSTEM_TEST_TIMEOUT)
+        executor.shutdown(wait=False, cancel_futures=True)
         
-        # Test 3: Report generation
-        try:
-            report = report_generator.generate_daily_report()
-            if len(report) > 100:
-                tests.append(("✅ Report Generation", f"Report generated ({len(report)} chars)"))
-            else:
-                tests.append(("⚠️ Report Generation", "Report too short"))
-        except Exception as e:
-            tests.append(("❌ Report Generation", f"Error: {e}"))
-        
-        # Test 4: Settings system
-        try:
-            summary = settings_manager.get_settings_summary()
-            tests.append(("✅ Settings System", f"Settings loaded ({summary['total_users']} users)"))
-        except Exception as e:
-            tests.append(("❌ Settings System", f"Error: {e}"))
-        
-        # Test 5: Scheduler system
-        try:
-            scheduler_summary = report_scheduler.get_schedule_summary()
-            tests.append(("✅ Scheduler System", f"Scheduler loaded ({scheduler_summary['total_reports']} reports)"))
-        except Exception as e:
-            tests.append(("❌ Scheduler System", f"Error: {e}"))
+        for future, name in futures.items():
+            if future not in done:
+                tests.append((f"⚠️ {name}", f"Timed out after {SYSTEM_TEST_TIMEOUT}s"))
+                continue
+            try:
+                tests.append(future.result())
+            except Exception as e:
+                tests.append((f"❌ {name}", f"Error: {e}"))
     
     # Display test results
     st.write("**Test Results:**")
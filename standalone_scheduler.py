@@ -11,20 +11,36 @@ Usage:
 
 import sys
 import os
-import time
 import argparse
+import logging
 import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
 # Add the current directory to sys.path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Same logger as utils.scheduler, so report runs and syncs from worker
+# threads go through the same handler, in order
+logger = logging.getLogger("fortified.scheduler")
+
+def setup_logging():
+    """Send scheduler log records to stdout as plain lines through one handler"""
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
 class StandaloneScheduler:
     """Standalone scheduler that runs independent of Streamlit"""
     
-    def __init__(self):
-        self.running = False
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._stop = threading.Event()
         self.report_scheduler = None
         self.report_generator = None
         
@@ -40,11 +56,11 @@ class StandaloneScheduler:
             # Register all report generators
             self.register_generators()
             
-            print("✅ Scheduler initialized successfully")
+            logger.info("✅ Scheduler initialized successfully")
             return True
             
         except Exception as e:
-            print(f"❌ Failed to initialize scheduler: {e}")
+            logger.error(f"❌ Failed to initialize scheduler: {e}")
             return False
     
     def register_generators(self):
@@ -61,49 +77,65 @@ class StandaloneScheduler:
         for report_type, generator_func in generators.items():
             self.report_scheduler.register_report_generator(report_type, generator_func)
         
-        print(f"✅ Registered {len(generators)} report generators")
+        logger.info(f"✅ Registered {len(generators)} report generators")
     
     def check_and_send_reports(self):
         """Check for due reports and send them"""
         try:
+            # Pick up schedules edited from the web interface since the last check
+            if self.report_scheduler.reload_if_changed():
+                logger.info(f"🔄 Reloaded {len(self.report_scheduler.scheduled_reports)} scheduled reports")
+            
             due_reports = self.report_scheduler.get_due_reports()
             
             if not due_reports:
-                print(f"ℹ️  [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] No reports due")
+                logger.info(f"ℹ️  [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] No reports due")
                 return True
             
-            print(f"📧 [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Found {len(due_reports)} due reports")
+            logger.info(f"📧 [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Found {len(due_reports)} due reports")
             
+            # Reports are I/O bound (Sheets reads, SMTP), so run them side by side
             success_count = 0
-            for report in due_reports:
-                print(f"   🔄 Processing: {report.name}")
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(due_reports)))) as executor:
+                futures = {}
+                for report in due_reports:
+                    logger.info(f"   🔄 Processing: {report.name}")
+                    futures[executor.submit(self.report_scheduler.run_report, report)] = report
                 
-                if self.report_scheduler.run_report(report):
-                    print(f"   ✅ Sent: {report.name}")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Failed: {report.name}")
+                for future in as_completed(futures):
+                    report = futures[future]
+                    try:
+                        sent = future.result()
+                    except Exception as e:
+                        logger.error(f"   ❌ Failed: {report.name} ({e})")
+                        continue
+                    
+                    if sent:
+                        logger.info(f"   ✅ Sent: {report.name}")
+                        success_count += 1
+                    else:
+                        logger.error(f"   ❌ Failed: {report.name}")
             
-            print(f"📊 Successfully sent {success_count}/{len(due_reports)} reports")
+            logger.info(f"📊 Successfully sent {success_count}/{len(due_reports)} reports")
             return success_count == len(due_reports)
             
         except Exception as e:
-            print(f"❌ Error checking/sending reports: {e}")
+            logger.error(f"❌ Error checking/sending reports: {e}")
             return False
     
     def test_email_settings(self):
         """Test email configuration"""
-        print("🧪 Testing email settings...")
+        logger.info("🧪 Testing email settings...")
         
         try:
             if self.report_scheduler.test_email_settings():
-                print("✅ Email test successful!")
+                logger.info("✅ Email test successful!")
                 return True
             else:
-                print("❌ Email test failed!")
+                logger.error("❌ Email test failed!")
                 return False
         except Exception as e:
-            print(f"❌ Email test error: {e}")
+            logger.error(f"❌ Email test error: {e}")
             return False
     
     def run_once(self):
@@ -111,14 +143,14 @@ class StandaloneScheduler:
         if not self.initialize():
             return False
         
-        print(f"🚀 Checking for due reports at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info(f"🚀 Checking for due reports at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         # Get summary
         summary = self.report_scheduler.get_schedule_summary()
-        print(f"📋 Status: {summary['enabled_reports']} enabled reports, {summary['due_reports']} due")
+        logger.info(f"📋 Status: {summary['enabled_reports']} enabled reports, {summary['due_reports']} due")
         
         if not summary['email_configured']:
-            print("⚠️  Warning: Email not configured. Reports will be generated but not sent.")
+            logger.warning("⚠️  Warning: Email not configured. Reports will be generated but not sent.")
         
         return self.check_and_send_reports()
     
@@ -127,33 +159,31 @@ class StandaloneScheduler:
         if not self.initialize():
             return False
         
-        self.running = True
+        self._stop.clear()
         
-        print(f"🔄 Starting daemon mode (checking every {check_interval} seconds)")
-        print("   Press Ctrl+C to stop")
+        logger.info(f"🔄 Starting daemon mode (checking every {check_interval} seconds)")
+        logger.info("   Press Ctrl+C to stop")
         
         # Set up signal handler for graceful shutdown
         def signal_handler(signum, frame):
-            print("\n🛑 Received shutdown signal, stopping scheduler...")
-            self.running = False
+            logger.info("\n🛑 Received shutdown signal, stopping scheduler...")
+            self._stop.set()
         
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
         
         try:
-            while self.running:
+            while not self._stop.is_set():
                 self.check_and_send_reports()
                 
-                # Sleep in small intervals so we can respond to signals
-                for _ in range(check_interval):
-                    if not self.running:
-                        break
-                    time.sleep(1)
-                    
+                # Wait out the interval in one call; the signal handler
+                # sets the event to wake it up early
+                self._stop.wait(check_interval)
+                
         except KeyboardInterrupt:
-            print("\n🛑 Interrupted by user")
+            logger.info("\n🛑 Interrupted by user")
         
-        print("✅ Scheduler stopped")
+        logger.info("✅ Scheduler stopped")
         return True
     
     def get_status(self):
@@ -163,21 +193,25 @@ class StandaloneScheduler:
         
         summary = self.report_scheduler.get_schedule_summary()
         
-        print("📊 Scheduler Status:")
-        print(f"   Total Reports: {summary['total_reports']}")
-        print(f"   Enabled Reports: {summary['enabled_reports']}")
-        print(f"   Due Reports: {summary['due_reports']}")
-        print(f"   Email Configured: {'✅' if summary['email_configured'] else '❌'}")
+        lines = [
+            "📊 Scheduler Status:",
+            f"   Total Reports: {summary['total_reports']}",
+            f"   Enabled Reports: {summary['enabled_reports']}",
+            f"   Due Reports: {summary['due_reports']}",
+            f"   Email Configured: {'✅' if summary['email_configured'] else '❌'}",
+        ]
         
         # Show scheduled reports
         if len(self.report_scheduler.scheduled_reports) > 0:
-            print("\n📋 Scheduled Reports:")
+            lines.append("\n📋 Scheduled Reports:")
             for report in self.report_scheduler.scheduled_reports:
                 status = "✅" if report.enabled else "⏸️"
                 next_run = report.next_run if report.next_run else "Not scheduled"
-                print(f"   {status} {report.name} ({report.frequency}) - Next: {next_run}")
+                lines.append(f"   {status} {report.name} ({report.frequency}) - Next: {next_run}")
         else:
-            print("\n📋 No reports scheduled")
+            lines.append("\n📋 No reports scheduled")
+        
+        logger.info("\n".join(lines))
 
 def main():
     """Main entry point"""
@@ -190,10 +224,14 @@ def main():
                        help='Show scheduler status and exit')
     parser.add_argument('--interval', '-i', type=int, default=300,
                        help='Check interval in seconds for daemon mode (default: 300)')
+    parser.add_argument('--workers', '-w', type=int, default=4,
+                       help='Number of due reports to run at once (default: 4)')
     
     args = parser.parse_args()
     
-    scheduler = StandaloneScheduler()
+    setup_logging()
+    
+    scheduler = StandaloneScheduler(max_workers=args.workers)
     
     if args.test:
         if scheduler.initialize():
@@ -207,12 +245,12 @@ def main():
         sys.exit(0)
     
     elif args.daemon:
-        print("🚀 Starting Fortified Insurance Report Scheduler (Daemon Mode)")
+        logger.info("🚀 Starting Fortified Insurance Report Scheduler (Daemon Mode)")
         success = scheduler.run_daemon(args.interval)
         sys.exit(0 if success else 1)
     
     else:
-        print("🚀 Running Fortified Insurance Report Scheduler (Single Check)")
+        logger.info("🚀 Running Fortified Insurance Report Scheduler (Single Check)")
         success = scheduler.run_once()
         sys.exit(0 if success else 1)
 
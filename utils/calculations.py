@@ -11,16 +11,31 @@ from datetime import date, datetime
 # Constants
 PROFITABILITY_THRESHOLD = 200  # Agents below this are considered "at risk"
 
+# Thousands separators and dollar signs stripped from text before numeric conversion
+_CURRENCY_PATTERN = r'[\$,]'
+
 def safe_divide(numerator: Union[pd.Series, float], denominator: Union[pd.Series, float]) -> Union[pd.Series, float]:
-    """Safely divide two series, returning 0 for division by zero"""
-    if isinstance(numerator, pd.Series) and isinstance(denominator, pd.Series):
-        return pd.Series(np.where(denominator != 0, numerator / denominator, 0), index=numerator.index)
-    elif isinstance(numerator, pd.Series):
-        return pd.Series(np.where(denominator != 0, numerator / denominator, 0), index=numerator.index)
+    """Safely divide two series, returning 0 for division by zero
+    
+    Series are divided with a single masked np.divide, so zero denominators
+    are skipped rather than divided and then replaced.
+    """
+    if isinstance(numerator, pd.Series):
+        index = numerator.index
     elif isinstance(denominator, pd.Series):
-        return pd.Series(np.where(denominator != 0, numerator / denominator, 0), index=denominator.index)
+        index = denominator.index
     else:
         return numerator / denominator if denominator != 0 else 0
+    
+    num = _float_array(numerator)
+    den = _float_array(denominator)
+    result = np.zeros(np.broadcast(num, den).shape)
+    np.divide(num, den, out=result, where=den != 0)
+    return pd.Series(result, index=index)
+
+def is_text_dtype(series: pd.Series) -> bool:
+    """Check for object or string (including string[pyarrow]) columns that may need cleaning"""
+    return series.dtype == 'object' or pd.api.types.is_string_dtype(series.dtype)
 
 def safe_numeric_conversion(series_or_value, fill_value=0):
     """Safely convert to numeric and handle fillna"""
@@ -41,6 +56,53 @@ def safe_sum(series_or_value):
     else:
         return series_or_value if not pd.isna(series_or_value) else 0
 
+def _ratio_kernel(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Divide two float arrays, returning 0 where the denominator is 0, rounded to 2 decimals"""
+    ratio = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+    return np.round(ratio * scale, 2)
+
+def _float_array(value: Union[pd.Series, float]) -> np.ndarray:
+    """Get a Series or scalar as a float64 NumPy array, with missing values as NaN"""
+    if isinstance(value, pd.Series):
+        return value.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.asarray(value, dtype=np.float64)
+
+def _column_array(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Get a column as a float64 NumPy array"""
+    return _float_array(df[col])
+
+def _strip_currency(series: pd.Series) -> pd.Series:
+    """Strip '$' and ',' from a column as text in one regex pass
+    
+    On pandas 3 with pyarrow, astype(str) gives an Arrow-backed string column,
+    so the replace runs in Arrow's compute kernels instead of per Python object.
+    """
+    return series.astype(str).str.replace(_CURRENCY_PATTERN, '', regex=True)
+
+def _to_numeric_columns(df: pd.DataFrame, cols: List[str]) -> None:
+    """Convert columns to numbers in place, filling unparseable values with 0
+    
+    Text columns have '$' and ',' stripped first; columns missing from the
+    frame are skipped.
+    """
+    cols = [col for col in cols if col in df.columns]
+    if not cols:
+        return
+    text_cols = [col for col in cols if is_text_dtype(df[col])]
+    if text_cols:
+        df[text_cols] = df[text_cols].apply(_strip_currency)
+    df[cols] = df[cols].apply(pd.to_numeric, errors='coerce').fillna(0)
+
+def _column_sums(df: pd.DataFrame, cols: List[str]) -> pd.Series:
+    """Sum columns as numbers, stripping '$' and ',' from text columns first
+    
+    Values that still don't parse are skipped, so such a column sums to 0.
+    """
+    numeric = df[cols].apply(
+        lambda col: pd.to_numeric(_strip_currency(col) if is_text_dtype(col) else col, errors='coerce')
+    )
+    return numeric.sum()
+
 def calculate_agent_profitability(df: pd.DataFrame) -> pd.DataFrame:
     """Process agent data - using existing calculations from the sheet
     
@@ -60,15 +122,12 @@ def calculate_agent_profitability(df: pd.DataFrame) -> pd.DataFrame:
     # First, check if we have the pre-calculated columns
     if 'Agent Profitability' in result.columns:
         # Use existing calculations
-        numeric_cols = ['Sales', 'Revenue', 'Count Paid Calls', 'Agent Profitability', 
-                       'Closing Ratio', 'Profit', 'Lead Spend']
+        numeric_cols = [col for col in ['Sales', 'Revenue', 'Count Paid Calls', 'Agent Profitability',
+                                        'Closing Ratio', 'Profit', 'Lead Spend'] if col in result.columns]
         
-        for col in numeric_cols:
-            if col in result.columns:
-                # Convert to numeric and fill NaN values
-                result[col] = pd.to_numeric(result[col], errors='coerce')
-                if isinstance(result[col], pd.Series):
-                    result.loc[:, col] = result[col].fillna(0)
+        # Convert to numeric and fill NaN values
+        if numeric_cols:
+            result[numeric_cols] = result[numeric_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
         
         # Rename columns for consistency with the dashboard
         result.rename(columns={
@@ -96,23 +155,13 @@ def calculate_agent_profitability(df: pd.DataFrame) -> pd.DataFrame:
         result.rename(columns=column_mapping, inplace=True)
         
         # Convert numeric columns - handle both numeric and string values
-        numeric_cols = ['totalCalls', 'paidCalls', 'totalSales', 'revenue']
-        for col in numeric_cols:
-            if col in result.columns:
-                # If column contains strings with commas, clean them first
-                if result[col].dtype == 'object':
-                    result[col] = result[col].astype(str).str.replace(',', '').str.replace('$', '')
-                numeric_series = pd.to_numeric(result[col], errors='coerce')
-                if isinstance(numeric_series, pd.Series):
-                    result[col] = numeric_series.fillna(0)
+        _to_numeric_columns(result, ['totalCalls', 'paidCalls', 'totalSales', 'revenue'])
         
         # Calculate closing ratio (sales / paid calls * 100)
         if 'totalSales' in result.columns and 'paidCalls' in result.columns:
-            total_sales = result['totalSales'] if isinstance(result['totalSales'], pd.Series) else pd.Series([result['totalSales']])
-            paid_calls = result['paidCalls'] if isinstance(result['paidCalls'], pd.Series) else pd.Series([result['paidCalls']])
-            result['closingRatio'] = safe_divide(total_sales, paid_calls) * 100
-            if isinstance(result['closingRatio'], pd.Series):
-                result['closingRatio'] = result['closingRatio'].round(2)
+            result['closingRatio'] = _ratio_kernel(
+                _column_array(result, 'totalSales'), _column_array(result, 'paidCalls'), 100
+            )
         
         # Calculate agent profitability only if lead spend is available in the data
         if 'revenue' in result.columns and 'leadSpend' in result.columns:
@@ -128,13 +177,9 @@ def calculate_agent_profitability(df: pd.DataFrame) -> pd.DataFrame:
     
     # Calculate revenue per call if not present
     if 'revenue' in result.columns and 'paidCalls' in result.columns and 'revenuePerCall' not in result.columns:
-        revenue = result['revenue'] if isinstance(result['revenue'], pd.Series) else pd.Series([result['revenue']])
-        paid_calls = result['paidCalls'] if isinstance(result['paidCalls'], pd.Series) else pd.Series([result['paidCalls']])
-        rev_per_call = safe_divide(revenue, paid_calls)
-        if isinstance(rev_per_call, pd.Series):
-            result['revenuePerCall'] = rev_per_call.round(2)
-        else:
-            result['revenuePerCall'] = round(rev_per_call, 2)
+        result['revenuePerCall'] = _ratio_kernel(
+            _column_array(result, 'revenue'), _column_array(result, 'paidCalls')
+        )
     
     return result
 
@@ -155,15 +200,8 @@ def calculate_campaign_roas(df: pd.DataFrame) -> pd.DataFrame:
     # Check if we have pre-calculated ROAS
     if 'ROAS' in result.columns:
         # Use existing calculations
-        numeric_cols = ['Paid Calls', '# Unique Sales', 'Revenue', 'Lead Cost', 
-                       'ROAS', 'Profit', '% Closing Ratio']
-        
-        for col in numeric_cols:
-            if col in result.columns:
-                if result[col].dtype == 'object':
-                    result[col] = result[col].astype(str).str.replace(',', '').str.replace('$', '')
-                numeric_series = pd.to_numeric(result[col], errors='coerce')
-                result[col] = numeric_series.fillna(0)
+        _to_numeric_columns(result, ['Paid Calls', '# Unique Sales', 'Revenue', 'Lead Cost',
+                                     'ROAS', 'Profit', '% Closing Ratio'])
         
         # Rename for consistency
         result.rename(columns={
@@ -191,13 +229,7 @@ def calculate_campaign_roas(df: pd.DataFrame) -> pd.DataFrame:
         result.rename(columns=column_mapping, inplace=True)
         
         # Convert numeric columns
-        numeric_cols = ['leads', 'sales', 'revenue', 'leadSpend']
-        for col in numeric_cols:
-            if col in result.columns:
-                if result[col].dtype == 'object':
-                    result[col] = result[col].astype(str).str.replace(',', '').str.replace('$', '')
-                numeric_series = pd.to_numeric(result[col], errors='coerce')
-                result[col] = numeric_series.fillna(0)
+        _to_numeric_columns(result, ['leads', 'sales', 'revenue', 'leadSpend'])
         
         # Calculate ROAS (revenue / spend)
         if 'revenue' in result.columns and 'leadSpend' in result.columns:
@@ -227,13 +259,17 @@ def calculate_campaign_roas(df: pd.DataFrame) -> pd.DataFrame:
 
 def aggregate_agency_stats(agency_df: pd.DataFrame, 
                          agent_df: pd.DataFrame,
-                         vendor_df: pd.DataFrame) -> Dict[str, Union[int, float]]:
+                         vendor_df: pd.DataFrame,
+                         agent_calc: Optional[pd.DataFrame] = None,
+                         vendor_calc: Optional[pd.DataFrame] = None) -> Dict[str, Union[int, float]]:
     """Aggregate statistics across all data sources
     
     Args:
         agency_df: Agency stats DataFrame
         agent_df: Agent totals DataFrame
         vendor_df: Vendor totals DataFrame
+        agent_calc: calculate_agent_profitability(agent_df), if the caller already has it
+        vendor_calc: calculate_campaign_roas(vendor_df), if the caller already has it
         
     Returns:
         Dictionary with aggregated metrics
@@ -252,39 +288,28 @@ def aggregate_agency_stats(agency_df: pd.DataFrame,
     
     # Agency stats
     if not agency_df.empty:
-        # Total Rev column contains revenue
-        if 'Total Rev' in agency_df.columns:
-            total_rev = agency_df['Total Rev']
-            if total_rev.dtype == 'object':
-                total_rev = total_rev.astype(str).str.replace(',', '').str.replace('$', '')
-            numeric_rev = pd.to_numeric(total_rev, errors='coerce')
-            stats['totalRevenue'] = float(numeric_rev.sum())
-        
-        # Total Leads column contains lead spend (based on diagnostic results)
-        if 'Total Leads' in agency_df.columns:
-            total_leads = agency_df['Total Leads']
-            if total_leads.dtype == 'object':
-                total_leads = total_leads.astype(str).str.replace(',', '').str.replace('$', '')
-            numeric_leads = pd.to_numeric(total_leads, errors='coerce')
-            stats['totalLeadSpend'] = float(numeric_leads.sum())
+        # Total Rev column contains revenue; Total Leads contains lead spend
+        # (based on diagnostic results)
+        total_cols = [col for col in ['Total Rev', 'Total Leads'] if col in agency_df.columns]
+        if total_cols:
+            totals = _column_sums(agency_df, total_cols)
+            if 'Total Rev' in totals:
+                stats['totalRevenue'] = float(totals['Total Rev'])
+            if 'Total Leads' in totals:
+                stats['totalLeadSpend'] = float(totals['Total Leads'])
         
         # Alternative: sum individual vendor columns if present
         vendor_cols = ['QW', 'QS', 'SF']
         if all(col in agency_df.columns for col in vendor_cols) and stats['totalLeadSpend'] == 0:
-            total_vendor_spend = 0.0
-            for col in vendor_cols:
-                col_data = agency_df[col]
-                if col_data.dtype == 'object':
-                    col_data = col_data.astype(str).str.replace(',', '').str.replace('$', '')
-                numeric_col = pd.to_numeric(col_data, errors='coerce')
-                total_vendor_spend += float(numeric_col.sum())
+            total_vendor_spend = sum(float(total) for total in _column_sums(agency_df, vendor_cols))
             if total_vendor_spend > 0:
                 stats['totalLeadSpend'] = total_vendor_spend
     
     # Agent stats
     if not agent_df.empty:
         # Process agent data
-        agent_calc = calculate_agent_profitability(agent_df)
+        if agent_calc is None:
+            agent_calc = calculate_agent_profitability(agent_df)
         stats['totalAgents'] = len(agent_calc)
         
         # Count at-risk agents
@@ -307,7 +332,8 @@ def aggregate_agency_stats(agency_df: pd.DataFrame,
     
     # Vendor stats (campaigns)
     if not vendor_df.empty:
-        vendor_calc = calculate_campaign_roas(vendor_df)
+        if vendor_calc is None:
+            vendor_calc = calculate_campaign_roas(vendor_df)
         
         # Get total leads (paid calls)
         if 'leads' in vendor_calc.columns:
@@ -321,11 +347,7 @@ def aggregate_agency_stats(agency_df: pd.DataFrame,
             if 'leadSpend' in vendor_calc.columns:
                 stats['totalLeadSpend'] = float(vendor_calc['leadSpend'].sum())
             elif 'Lead Cost' in vendor_df.columns:
-                lead_cost = vendor_df['Lead Cost']
-                if lead_cost.dtype == 'object':
-                    lead_cost = lead_cost.astype(str).str.replace(',', '').str.replace('$', '')
-                numeric_cost = pd.to_numeric(lead_cost, errors='coerce')
-                stats['totalLeadSpend'] = float(numeric_cost.sum())
+                stats['totalLeadSpend'] = float(_column_sums(vendor_df, ['Lead Cost'])['Lead Cost'])
         
         # Calculate average ROAS (exclude zeros)
         if 'ROAS' in vendor_calc.columns:
@@ -346,12 +368,14 @@ def aggregate_agency_stats(agency_df: pd.DataFrame,
     
     return stats
 
-def get_top_performers(agent_df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+def get_top_performers(agent_df: pd.DataFrame, n: int = 10,
+                       agent_calc: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """Get top performing agents by profitability
     
     Args:
         agent_df: DataFrame with agent data
         n: Number of top performers to return
+        agent_calc: calculate_agent_profitability(agent_df), if the caller already has it
         
     Returns:
         DataFrame with top performers (positive profitability only)
@@ -359,7 +383,7 @@ def get_top_performers(agent_df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
     if agent_df.empty:
         return pd.DataFrame()
     
-    df_calc = calculate_agent_profitability(agent_df)
+    df_calc = agent_calc if agent_calc is not None else calculate_agent_profitability(agent_df)
     
     if 'agentProfitability' in df_calc.columns:
         # Filter to only positive profitability and sort descending
@@ -372,19 +396,21 @@ def get_top_performers(agent_df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
     
     return pd.DataFrame()
 
-def get_at_risk_agents(agent_df: pd.DataFrame) -> pd.DataFrame:
+def get_at_risk_agents(agent_df: pd.DataFrame,
+                       agent_calc: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """Get agents with profitability below threshold
     
     Args:
         agent_df: DataFrame with agent data
+        agent_calc: calculate_agent_profitability(agent_df), if the caller already has it
         
     Returns:
-        DataFrame with at-risk agents
+        DataFrame with at-risk agents, least profitable first
     """
     if agent_df.empty:
         return pd.DataFrame()
     
-    df_calc = calculate_agent_profitability(agent_df)
+    df_calc = agent_calc if agent_calc is not None else calculate_agent_profitability(agent_df)
     
     if 'agentProfitability' in df_calc.columns:
         # Get agents below threshold
@@ -395,13 +421,15 @@ def get_at_risk_agents(agent_df: pd.DataFrame) -> pd.DataFrame:
 
 def get_campaign_performance(vendor_df: pd.DataFrame, 
                            sort_by: str = 'ROAS',
-                           ascending: bool = False) -> pd.DataFrame:
+                           ascending: bool = False,
+                           vendor_calc: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """Get campaign performance sorted by metric
     
     Args:
         vendor_df: DataFrame with vendor/campaign data
         sort_by: Column to sort by
         ascending: Sort order
+        vendor_calc: calculate_campaign_roas(vendor_df), if the caller already has it
         
     Returns:
         DataFrame sorted by specified metric
@@ -409,7 +437,7 @@ def get_campaign_performance(vendor_df: pd.DataFrame,
     if vendor_df.empty:
         return pd.DataFrame()
     
-    df_calc = calculate_campaign_roas(vendor_df)
+    df_calc = vendor_calc if vendor_calc is not None else calculate_campaign_roas(vendor_df)
     
     # Filter out campaigns with zero ROAS if sorting by ROAS
     if sort_by == 'ROAS' and 'ROAS' in df_calc.columns:
@@ -443,10 +471,10 @@ def calculate_period_comparison(current_df: pd.DataFrame,
     current_data = current_df[metric_col]
     previous_data = previous_df[metric_col]
     
-    if current_data.dtype == 'object':
-        current_data = current_data.astype(str).str.replace(',', '').str.replace('$', '')
-    if previous_data.dtype == 'object':
-        previous_data = previous_data.astype(str).str.replace(',', '').str.replace('$', '')
+    if is_text_dtype(current_data):
+        current_data = _strip_currency(current_data)
+    if is_text_dtype(previous_data):
+        previous_data = _strip_currency(previous_data)
     
     current_numeric = pd.to_numeric(current_data, errors='coerce')
     previous_numeric = pd.to_numeric(previous_data, errors='coerce')
@@ -475,18 +503,14 @@ def get_weekly_summary(df: pd.DataFrame,
     if df.empty or date_col not in df.columns:
         return pd.DataFrame()
     
-    # Convert date column
-    df[date_col] = pd.to_datetime(df[date_col])
-    
-    # Group by week
-    df['Week'] = df[date_col].dt.to_period('W')
-    
     if metric_cols is None:
         # Automatically detect numeric columns
-        metric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        metric_cols = [col for col in df.select_dtypes(include=[np.number]).columns if col != date_col]
     
-    # Aggregate
-    weekly = df.groupby('Week')[metric_cols].sum().reset_index()
+    # Group by week on a key Series so the caller's frame is neither copied
+    # nor mutated; weeks without rows are left out as before
+    week = pd.to_datetime(df[date_col]).dt.to_period('W').rename('Week')
+    weekly = df[metric_cols].groupby(week).sum().reset_index()
     weekly['Week'] = weekly['Week'].astype(str)
     
     return weekly
@@ -507,18 +531,14 @@ def get_monthly_summary(df: pd.DataFrame,
     if df.empty or date_col not in df.columns:
         return pd.DataFrame()
     
-    # Convert date column
-    df[date_col] = pd.to_datetime(df[date_col])
-    
-    # Group by month
-    df['Month'] = df[date_col].dt.to_period('M')
-    
     if metric_cols is None:
         # Automatically detect numeric columns
-        metric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        metric_cols = [col for col in df.select_dtypes(include=[np.number]).columns if col != date_col]
     
-    # Aggregate
-    monthly = df.groupby('Month')[metric_cols].sum().reset_index()
+    # Group by month on a key Series, as in get_weekly_summary, so the
+    # caller's frame is not mutated
+    month = pd.to_datetime(df[date_col]).dt.to_period('M').rename('Month')
+    monthly = df[metric_cols].groupby(month).sum().reset_index()
     monthly['Month'] = monthly['Month'].astype(str)
     
     return monthly
\ No newline at end of file
@@ -3,16 +3,22 @@ Google Sheets connection and data retrieval utilities
 """
 
 import streamlit as st
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import pandas as pd
 from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import time
 import numpy as np
 import random
 
+from .sheets_client import get_credentials, get_sheets_service
+
+# Scopes for the app's connection; the diagnostic scripts use the read-only default
+SCOPES = (
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive.readonly'
+)
+
 
 def excel_date_to_datetime(excel_date):
     """Convert Excel serial date to Python datetime"""
@@ -35,6 +41,67 @@ def clean_numeric_value(value):
     return value
 
 
+# Header variants seen in the sheets, mapped to the standard header the
+# calculations expect. Applied once at load time so the cached frames carry
+# canonical column names.
+COLUMN_ALIASES = {
+    "Daily Agency Stats": {
+        'agency': 'Agency',
+        'date': 'Date',
+        'DATE': 'Date',
+        'revenue': 'Total Rev',
+        'Revenue': 'Total Rev',
+        'Total Revenue': 'Total Rev',
+    },
+    "Daily Agent Totals": {
+        'Agent': 'Agent Name',
+        'agentName': 'Agent Name',
+        'Total Sales': 'Sales',
+        'sales': 'Sales',
+        'Total Revenue': 'Revenue',
+        'totalRevenue': 'Revenue',
+        'profitability': 'Agent Profitability',
+        'Close Rate': 'Closing Ratio',
+        'closeRate': 'Closing Ratio',
+        'paidCalls': 'Count Paid Calls',
+    },
+    "Daily Lead Vendor Totals": {
+        'Vendor': 'Campaign',
+        'campaign': 'Campaign',
+        'paidCalls': 'Paid Calls',
+        'uniqueSales': '# Unique Sales',
+        'Total Revenue': 'Revenue',
+        'Lead Spend': 'Lead Cost',
+        'spend': 'Lead Cost',
+        'roas': 'ROAS',
+        'Net Profit': 'Profit',
+    },
+}
+
+
+def normalize_columns(df: pd.DataFrame, sheet_name: str) -> pd.DataFrame:
+    """Rename header variants of a sheet to its standard column names
+    
+    An alias is only applied when the standard column is not already present.
+    
+    Args:
+        df: DataFrame read from the sheet
+        sheet_name: Name of the sheet the data came from
+        
+    Returns:
+        DataFrame with canonical column names
+    """
+    aliases = COLUMN_ALIASES.get(sheet_name)
+    if not aliases:
+        return df
+    
+    renames = {
+        col: aliases[col] for col in df.columns
+        if col in aliases and aliases[col] not in df.columns
+    }
+    return df.rename(columns=renames) if renames else df
+
+
 class GoogleSheetsConnection:
     """Handle all Google Sheets operations"""
     
@@ -46,17 +113,9 @@ class GoogleSheetsConnection:
         """
         self.spreadsheet_id = spreadsheet_id or st.secrets["SPREADSHEET_ID"]
         
-        # Create credentials with required scopes
-        self.creds = service_account.Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"],
-            scopes=[
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive.readonly'
-            ]
-        )
-        
-        # Build the service
-        self.service = build('sheets', 'v4', credentials=self.creds)
+        # Credentials and the service are shared rather than rebuilt per connection
+        self.creds = get_credentials(SCOPES)
+        self.service = get_sheets_service(SCOPES, timeout=60)
         
         # Cache for sheet metadata
         self._sheet_info = None
@@ -107,10 +166,15 @@ class GoogleSheetsConnection:
                     raise e
     
     def get_sheet_info(self) -> Dict[str, Any]:
-        """Get spreadsheet metadata"""
+        """Get spreadsheet metadata
+        
+        Only the spreadsheet title and each sheet's properties (title, id,
+        grid size) are requested; merges, formats and named ranges are left out.
+        """
         if not self._sheet_info:
             self._sheet_info = self.service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
+                spreadsheetId=self.spreadsheet_id,
+                fields='properties.title,sheets.properties'
             ).execute()
         return self._sheet_info
     
@@ -120,92 +184,66 @@ class GoogleSheetsConnection:
         sheets = info.get('sheets', [])
         return [sheet['properties']['title'] for sheet in sheets]
     
-    def read_sheet(self, sheet_name: str, range_name: str = "A:Z") -> pd.DataFrame:
-        """Read data from a specific sheet and range
+    def _sheet_range(self, sheet_name: str, range_name: str = "A:Z") -> str:
+        """Get the A1 range to read for a sheet
+        
+        Daily Agency Stats has a merged header row, so it is read from row 2.
+        """
+        if sheet_name == "Daily Agency Stats":
+            return f"{sheet_name}!A2:Z1000"
+        return f"{sheet_name}!{range_name}"
+    
+    def _values_to_dataframe(self, sheet_name: str, values: List[List[Any]]) -> pd.DataFrame:
+        """Build a cleaned DataFrame from raw sheet values
         
         Args:
-            sheet_name: Name of the sheet
-            range_name: A1 notation range (default: all columns)
+            sheet_name: Name of the sheet the values came from
+            values: Rows returned by the API, headers first
             
         Returns:
             DataFrame with the sheet data
         """
-        try:
-            # For Daily Agency Stats, we need to handle the merged cells differently
-            if sheet_name == "Daily Agency Stats":
-                # Read with formatted values to handle merged cells better
-                request = self.service.spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=f"{sheet_name}!A2:Z1000",  # Start from row 2, skip merged header row
-                    valueRenderOption='FORMATTED_VALUE'
-                )
-                result = self._execute_with_retry(request)
-                
-                values = result.get('values', [])
-                
-                if not values or len(values) < 2:
-                    return pd.DataFrame()
-                
-                # First row (A2:Z2) contains headers
-                headers = values[0]
-                # Data starts from second row
-                data = values[1:]
-                
-                # Create DataFrame
-                df = pd.DataFrame(data, columns=headers)
-                
-                # Clean column names
-                df.columns = df.columns.str.strip()
-                
-                # Convert Date column from string to datetime
-                if 'Date' in df.columns:
-                    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-                
-                # Clean numeric columns (remove commas and dollar signs)
-                numeric_columns = ['FE', 'Adroit', 'Total Rev', 'QW', 'QS', 'SF', 'Total Leads']
-                for col in numeric_columns:
-                    if col in df.columns:
-                        # Replace commas
-                        df[col] = df[col].astype(str).str.replace(',', '')
-                        # Replace dollar signs
-                        df[col] = df[col].str.replace('$', '')
-                        # Convert to numeric
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                
-                return df
+        if not values or len(values) < 2:
+            return pd.DataFrame()
+        
+        # First row contains headers, data starts from the second row
+        df = pd.DataFrame(values[1:], columns=values[0])
+        
+        # Clean column names
+        df.columns = df.columns.str.strip()
+        df = normalize_columns(df, sheet_name)
+        
+        if sheet_name == "Daily Agency Stats":
+            # Convert Date column to datetime (formatted strings or Excel serials)
+            if 'Date' in df.columns:
+                df['Date'] = pd.to_datetime(df['Date'].apply(excel_date_to_datetime), errors='coerce')
             
-            else:
-                # For other sheets, use the normal method
-                full_range = f"{sheet_name}!{range_name}"
-                
-                # Get the data with unformatted values
-                request = self.service.spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=full_range,
-                    valueRenderOption='UNFORMATTED_VALUE'
-                )
-                result = self._execute_with_retry(request)
-                
-                values = result.get('values', [])
-                
-                if not values or len(values) < 2:
-                    return pd.DataFrame()
-                
-                # Normal sheets with headers in row 1
-                df = pd.DataFrame(values[1:], columns=values[0])
-                
-                # Clean column names
-                df.columns = df.columns.str.strip()
-                
-                # Convert Excel date columns
-                date_columns = ['Date', 'date', 'DATE', 'Week of']
-                for col in date_columns:
-                    if col in df.columns:
-                        df[col] = df[col].apply(excel_date_to_datetime)
-                
-                return df
-                
-        except HttpError as e:
+            # Clean numeric columns (remove commas and dollar signs)
+            numeric_columns = ['FE', 'Adroit', 'Total Rev', 'QW', 'QS', 'SF', 'Total Leads']
+            for col in numeric_columns:
+                if col in df.columns:
+                    # Replace commas
+                    df[col] = df[col].astype(str).str.replace(',', '')
+                    # Replace dollar signs
+                    df[col] = df[col].str.replace('$', '')
+                    # Convert to numeric
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
+        else:
+            # Convert Excel date columns
+            date_columns = ['Date', 'date', 'DATE', 'Week of']
+            for col in date_columns:
+                if col in df.columns:
+                    df[col] = df[col].apply(excel_date_to_datetime)
+        
+        # Dictionary-encode the agency so agency filters compare integer codes
+        if 'Agency' in df.columns:
+            df['Agency'] = df['Agency'].astype('category')
+        
+        return df
+    
+    def _report_read_error(self, e: Exception, sheet_name: str):
+        """Show a user-facing message for a failed sheet read"""
+        if isinstance(e, HttpError):
             error_code = e.resp.status if hasattr(e, 'resp') and hasattr(e.resp, 'status') else 'Unknown'
             
             if error_code == 503:
@@ -218,20 +256,85 @@ class GoogleSheetsConnection:
                 st.error(f"Sheet '{sheet_name}' not found. Please check the sheet name.")
             else:
                 st.error(f"Error reading sheet '{sheet_name}': {str(e)}")
+        else:
+            st.error(f"Unexpected error reading sheet '{sheet_name}': {str(e)}")
+    
+    def read_sheet(self, sheet_name: str, range_name: str = "A:Z") -> pd.DataFrame:
+        """Read data from a specific sheet and range
+        
+        Args:
+            sheet_name: Name of the sheet
+            range_name: A1 notation range (default: all columns)
             
-            return pd.DataFrame()
+        Returns:
+            DataFrame with the sheet data
+        """
+        try:
+            # Daily Agency Stats is read with formatted values to handle its
+            # merged cells better; other sheets use unformatted values
+            if sheet_name == "Daily Agency Stats":
+                value_render_option = 'FORMATTED_VALUE'
+            else:
+                value_render_option = 'UNFORMATTED_VALUE'
+            
+            request = self.service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=self._sheet_range(sheet_name, range_name),
+                valueRenderOption=value_render_option
+            )
+            result = self._execute_with_retry(request)
+            
+            return self._values_to_dataframe(sheet_name, result.get('values', []))
+                
         except Exception as e:
-            st.error(f"Unexpected error reading sheet '{sheet_name}': {str(e)}")
+            self._report_read_error(e, sheet_name)
             return pd.DataFrame()
     
-    def read_sheet_with_date_filter(self, sheet_name: str, 
-                                   start_date: date, 
-                                   end_date: date,
-                                   date_column: str = "date") -> pd.DataFrame:
-        """Read sheet data filtered by date range
+    def read_sheets(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        """Read several sheets in a single batchGet request
+        
+        All sheets are read with unformatted values; dates come back as
+        Excel serials and are converted the same way as in read_sheet. If
+        the batch request fails, each sheet is read with read_sheet instead.
         
         Args:
-            sheet_name: Name of the sheet
+            sheet_names: Names of the sheets to read
+            
+        Returns:
+            Dictionary mapping sheet name to its DataFrame
+        """
+        try:
+            request = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[self._sheet_range(sheet_name) for sheet_name in sheet_names],
+                valueRenderOption='UNFORMATTED_VALUE',
+                fields='valueRanges(values)'
+            )
+            result = self._execute_with_retry(request)
+            
+            value_ranges = result.get('valueRanges', [])
+            return {
+                sheet_name: self._values_to_dataframe(sheet_name, value_range.get('values', []))
+                for sheet_name, value_range in zip(sheet_names, value_ranges)
+            }
+        
+        except HttpError:
+            # One bad range (e.g. a renamed sheet) fails the whole batch, so
+            # read the sheets one by one and only empty the ones that fail
+            return {sheet_name: self.read_sheet(sheet_name) for sheet_name in sheet_names}
+                
+        except Exception as e:
+            self._report_read_error(e, ", ".join(sheet_names))
+            return {sheet_name: pd.DataFrame() for sheet_name in sheet_names}
+    
+    def filter_by_date(self, df: pd.DataFrame,
+                       start_date: date,
+                       end_date: date,
+                       date_column: str = "date") -> pd.DataFrame:
+        """Filter sheet data by date range
+        
+        Args:
+            df: DataFrame returned by read_sheet
             start_date: Start date for filtering
             end_date: End date for filtering
             date_column: Name of the date column
@@ -239,9 +342,6 @@ class GoogleSheetsConnection:
         Returns:
             Filtered DataFrame
         """
-        # Read all data
-        df = self.read_sheet(sheet_name)
-        
         if df.empty:
             return df
         
@@ -277,6 +377,44 @@ class GoogleSheetsConnection:
             st.warning(f"Date filtering failed: {str(e)}. Returning all data.")
             return df
     
+    def filter_by_agency(self, df: pd.DataFrame, agency: Optional[str]) -> pd.DataFrame:
+        """Filter sheet data to a single agency
+        
+        Args:
+            df: DataFrame returned by read_sheet
+            agency: Agency name; None keeps all rows
+            
+        Returns:
+            Filtered DataFrame
+        """
+        if agency is None or df.empty:
+            return df
+        
+        # Check for both possible column names
+        for col in ('Agency', 'agency'):
+            if col in df.columns:
+                return df[df[col] == agency]
+        return df
+    
+    def read_sheet_with_date_filter(self, sheet_name: str, 
+                                   start_date: date, 
+                                   end_date: date,
+                                   date_column: str = "date") -> pd.DataFrame:
+        """Read sheet data filtered by date range
+        
+        Args:
+            sheet_name: Name of the sheet
+            start_date: Start date for filtering
+            end_date: End date for filtering
+            date_column: Name of the date column
+            
+        Returns:
+            Filtered DataFrame
+        """
+        # Read all data
+        df = self.read_sheet(sheet_name)
+        return self.filter_by_date(df, start_date, end_date, date_column)
+    
     def append_row(self, sheet_name: str, values: List[Any]) -> bool:
         """Append a row to a sheet
         
@@ -359,70 +497,147 @@ class GoogleSheetsConnection:
 
 
 # Cached data loading functions
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_agency_stats(start_date: date, end_date: date) -> pd.DataFrame:
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def load_agency_stats(start_date: date, end_date: date, agency: Optional[str] = None) -> pd.DataFrame:
     """Load agency statistics with caching"""
     gs = GoogleSheetsConnection()
-    return gs.read_sheet_with_date_filter("Daily Agency Stats", start_date, end_date)
+    df = gs.read_sheet_with_date_filter("Daily Agency Stats", start_date, end_date)
+    return gs.filter_by_agency(df, agency).convert_dtypes(dtype_backend="pyarrow")
 
 
-@st.cache_data(ttl=300)
-def load_agent_totals(start_date: date, end_date: date) -> pd.DataFrame:
+@st.cache_data(ttl=300, show_spinner=False)
+def load_agent_totals(start_date: date, end_date: date, agency: Optional[str] = None) -> pd.DataFrame:
     """Load agent totals with caching"""
     gs = GoogleSheetsConnection()
-    return gs.read_sheet_with_date_filter("Daily Agent Totals", start_date, end_date)
+    df = gs.read_sheet_with_date_filter("Daily Agent Totals", start_date, end_date)
+    return gs.filter_by_agency(df, agency).convert_dtypes(dtype_backend="pyarrow")
 
 
-@st.cache_data(ttl=300)
-def load_vendor_totals(start_date: date, end_date: date) -> pd.DataFrame:
+@st.cache_data(ttl=300, show_spinner=False)
+def load_vendor_totals(start_date: date, end_date: date, agency: Optional[str] = None) -> pd.DataFrame:
     """Load vendor totals with caching"""
     gs = GoogleSheetsConnection()
-    return gs.read_sheet_with_date_filter("Daily Lead Vendor Totals", start_date, end_date)
+    df = gs.read_sheet_with_date_filter("Daily Lead Vendor Totals", start_date, end_date)
+    return gs.filter_by_agency(df, agency).convert_dtypes(dtype_backend="pyarrow")
+
+
+# Sheets shown on the dashboard, in the order load_all_dashboard_sheets returns them
+DASHBOARD_SHEETS = ["Daily Agency Stats", "Daily Agent Totals", "Daily Lead Vendor Totals"]
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_dashboard_sheets(start_date: date, end_date: date) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Read the dashboard sheets in a single batchGet, filtered to the date range
+    
+    Frames use pyarrow-backed dtypes so string, groupby and categorical
+    operations downstream run in Arrow kernels.
+    """
+    gs = GoogleSheetsConnection()
+    frames = gs.read_sheets(DASHBOARD_SHEETS)
+    return tuple(
+        gs.filter_by_date(frames[sheet_name], start_date, end_date).convert_dtypes(dtype_backend="pyarrow")
+        for sheet_name in DASHBOARD_SHEETS
+    )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_all_dashboard_sheets(start_date: date, end_date: date,
+                              agency: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Load agency, agent and vendor data with caching
+    
+    The Sheets values API has no row filter, so the date-filtered read is
+    cached once per date range and each agency selection is served from it.
+    
+    Args:
+        start_date: Start date for filtering
+        end_date: End date for filtering
+        agency: Agency name to filter to; None returns all agencies
+        
+    Returns:
+        Tuple of (agency_df, agent_df, vendor_df)
+    """
+    gs = GoogleSheetsConnection()
+    return tuple(
+        gs.filter_by_agency(df, agency)
+        for df in _load_dashboard_sheets(start_date, end_date)
+    )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_daily_revenue(start_date: date, end_date: date, agency: Optional[str] = None) -> pd.DataFrame:
+    """Load total agency revenue per day with caching
+    
+    Args:
+        start_date: Start date for filtering
+        end_date: End date for filtering
+        agency: Agency name to filter to; None returns all agencies
+        
+    Returns:
+        DataFrame with Date and Total Rev columns, one row per day
+    """
+    agency_df = load_all_dashboard_sheets(start_date, end_date, agency)[0]
+    if 'Date' not in agency_df.columns or 'Total Rev' not in agency_df.columns:
+        return pd.DataFrame()
+    return agency_df.groupby('Date', as_index=False)['Total Rev'].sum()
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_agency_list() -> List[str]:
-    """Get unique list of agencies"""
+    """Get unique list of agencies with caching
+    
+    Reuses the batched dashboard read, so the default "Today" view shares
+    its Sheets request with the dashboard data.
+    """
     # Try to get from today's data first
     today = date.today()
-    df = load_agency_stats(today, today)
-    
-    # Check for both possible column names
-    agency_col = None
-    if 'Agency' in df.columns:
-        agency_col = 'Agency'
-    elif 'agency' in df.columns:
-        agency_col = 'agency'
+    df = _load_dashboard_sheets(today, today)[0]
     
-    if df.empty or agency_col is None:
+    if df.empty or 'Agency' not in df.columns:
         # If no data today, look back 30 days
-        from datetime import timedelta
         start_date = today - timedelta(days=30)
-        df = load_agency_stats(start_date, today)
-        
-        # Check again for column names
-        if 'Agency' in df.columns:
-            agency_col = 'Agency'
-        elif 'agency' in df.columns:
-            agency_col = 'agency'
+        df = _load_dashboard_sheets(start_date, today)[0]
     
-    if not df.empty and agency_col:
-        return sorted(df[agency_col].unique().tolist())
+    if not df.empty and 'Agency' in df.columns:
+        return sorted(df['Agency'].dropna().unique().tolist())
     
     return []
 
 
-def get_sheet_data(sheet_name: str) -> pd.DataFrame:
+def get_sheet_data(sheet_name: str,
+                   start_date: Optional[date] = None,
+                   end_date: Optional[date] = None) -> pd.DataFrame:
     """Simple wrapper function for getting sheet data
     
     Args:
         sheet_name: Name of the sheet to read
+        start_date: Optional start date; with end_date, filters rows by Date
+        end_date: Optional end date
         
     Returns:
         DataFrame with sheet data
     """
     try:
         gs = GoogleSheetsConnection()
+        if start_date and end_date:
+            return gs.read_sheet_with_date_filter(sheet_name, start_date, end_date)
         return gs.read_sheet(sheet_name)
     except Exception as e:
         st.error(f"Error reading sheet '{sheet_name}': {e}")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
+
+
+def get_sheets_batch(sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+    """Read several sheets in a single batchGet request
+    
+    Args:
+        sheet_names: Names of the sheets to read
+        
+    Returns:
+        Dictionary mapping sheet name to its DataFrame
+    """
+    try:
+        gs = GoogleSheetsConnection()
+        return gs.read_sheets(sheet_names)
+    except Exception as e:
+        st.error(f"Error reading sheets {', '.join(sheet_names)}: {e}")
+        return {sheet_name: pd.DataFrame() for sheet_name in sheet_names}
\ No newline at end of file
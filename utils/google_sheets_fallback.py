@@ -5,7 +5,7 @@ Fallback data provider for when Google Sheets is unavailable
 import pandas as pd
 import streamlit as st
 from datetime import datetime, date, timedelta
-from typing import Optional
+from typing import Dict, List, Optional
 import json
 import os
 
@@ -235,8 +235,14 @@ def get_fallback_data(sheet_name: str) -> pd.DataFrame:
         # Generic empty DataFrame
         return pd.DataFrame()
 
-def get_sheet_data_with_fallback(sheet_name: str) -> pd.DataFrame:
-    """Get sheet data with automatic fallback to cached or sample data"""
+def get_sheet_data_with_fallback(sheet_name: str,
+                                 start_date: Optional[date] = None,
+                                 end_date: Optional[date] = None) -> pd.DataFrame:
+    """Get sheet data with automatic fallback to cached or sample data
+    
+    When start_date and end_date are given, live data is filtered to that
+    range before it is returned; cached and sample data are returned whole.
+    """
     try:
         # Try to import and use the main Google Sheets module
         from .google_sheets import GoogleSheetsConnection
@@ -248,6 +254,8 @@ def get_sheet_data_with_fallback(sheet_name: str) -> pd.DataFrame:
         # If successful, cache the data
         if not df.empty:
             data_cache.save_data(sheet_name, df)
+            if start_date and end_date:
+                return gs.filter_by_date(df, start_date, end_date)
             return df
         else:
             # Empty result, use fallback
@@ -255,16 +263,56 @@ def get_sheet_data_with_fallback(sheet_name: str) -> pd.DataFrame:
             
     except Exception as e:
         # Google Sheets failed, use fallback
-        error_msg = str(e)
-        if "503" in error_msg or "unavailable" in error_msg.lower():
-            st.error("🔄 Google Sheets is temporarily unavailable. Using cached or sample data.")
-        elif "429" in error_msg or "rate limit" in error_msg.lower():
-            st.error("⏰ API rate limit reached. Using cached or sample data.")
-        else:
-            st.error(f"📊 Google Sheets error: {error_msg}. Using fallback data.")
-        
+        _report_fallback_error(e)
         return get_fallback_data(sheet_name)
 
+def get_sheets_with_fallback(sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+    """Get several sheets in one batchGet request with per-sheet fallback
+    
+    Sheets that come back empty fall back to cached or sample data the same
+    way as get_sheet_data_with_fallback; the others are cached.
+    
+    Args:
+        sheet_names: Names of the sheets to read
+        
+    Returns:
+        Dictionary mapping sheet name to its DataFrame
+    """
+    try:
+        from .google_sheets import GoogleSheetsConnection
+        frames = GoogleSheetsConnection().read_sheets(sheet_names)
+    except Exception as e:
+        _report_fallback_error(e)
+        frames = {}
+    
+    results = {}
+    for sheet_name in sheet_names:
+        df = frames.get(sheet_name, pd.DataFrame())
+        if df.empty:
+            results[sheet_name] = get_fallback_data(sheet_name)
+        else:
+            data_cache.save_data(sheet_name, df)
+            results[sheet_name] = df
+    return results
+
+def _report_fallback_error(e: Exception):
+    """Show why live data could not be read before falling back"""
+    error_msg = str(e)
+    if "503" in error_msg or "unavailable" in error_msg.lower():
+        st.error("🔄 Google Sheets is temporarily unavailable. Using cached or sample data.")
+    elif "429" in error_msg or "rate limit" in error_msg.lower():
+        st.error("⏰ API rate limit reached. Using cached or sample data.")
+    else:
+        st.error(f"📊 Google Sheets error: {error_msg}. Using fallback data.")
+
+@st.cache_data(ttl=60, show_spinner=False)
+def probe_data_source() -> bool:
+    """Check whether agency data is available, cached for a minute
+    
+    Returns a bool rather than the DataFrame so cache hits stay cheap.
+    """
+    return not get_sheet_data_with_fallback('Daily Agency Stats').empty
+
 def clear_cache():
     """Clear all cached data"""
     try:
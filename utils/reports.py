@@ -29,7 +29,7 @@ except ImportError:
     try:
         from .google_sheets_fallback import get_sheet_data_with_fallback as get_sheet_data
     except ImportError:
-        def get_sheet_data(sheet_name):
+        def get_sheet_data(sheet_name, start_date=None, end_date=None):
             import pandas as pd
             return pd.DataFrame()
 
@@ -107,11 +107,11 @@ class ReportGenerator:
         try:
             # Try to load from Google Sheets first, with fallback to sample data if needed
             from .google_sheets_fallback import get_sheet_data_with_fallback
-            data = get_sheet_data_with_fallback(sheet_name)
+            data = get_sheet_data_with_fallback(sheet_name, start_date, end_date)
             
         except ImportError:
             # Fallback to basic data loading with manual filtering
-            data = get_sheet_data(sheet_name)
+            data = get_sheet_data(sheet_name, start_date, end_date)
         
         # Ensure we have a DataFrame
         if not isinstance(data, pd.DataFrame):
@@ -194,10 +194,13 @@ class ReportGenerator:
             if include_campaigns and user_role in ['management', 'admin']:
                 vendor_data = self._load_filtered_data('Daily Lead Vendor Totals', start_date, end_date, agency)
             
-            # Calculate metrics
-            stats = aggregate_agency_stats(agency_data, agent_data, vendor_data)
-            top_agents = get_top_performers(agent_data, n=5)
-            at_risk_agents = get_at_risk_agents(agent_data)
+            # Calculate metrics, processing the agent and vendor data once for all of them
+            agent_calc = calculate_agent_profitability(agent_data)
+            vendor_calc = calculate_campaign_roas(vendor_data)
+            stats = aggregate_agency_stats(agency_data, agent_data, vendor_data,
+                                           agent_calc=agent_calc, vendor_calc=vendor_calc)
+            top_agents = get_top_performers(agent_data, n=5, agent_calc=agent_calc)
+            at_risk_agents = get_at_risk_agents(agent_data, agent_calc=agent_calc)
             
             # Format report date and agency info
             if start_date:
@@ -262,7 +265,7 @@ class ReportGenerator:
             
             # Add campaign analysis for management/admin users
             if include_campaigns and user_role in ['management', 'admin'] and not vendor_data.empty:
-                campaign_performance = get_campaign_performance(vendor_data)
+                campaign_performance = get_campaign_performance(vendor_data, vendor_calc=vendor_calc)
                 report_html += f"""
                 <h2>Campaign Performance</h2>
                 {self._format_campaign_table(campaign_performance)}
@@ -322,9 +325,12 @@ class ReportGenerator:
             elif not vendor_data.empty:
                 vendor_weekly = vendor_data
             
-            # Calculate metrics
-            stats = aggregate_agency_stats(agency_weekly, agent_weekly, vendor_weekly)
-            top_agents = get_top_performers(agent_weekly, n=10)
+            # Calculate metrics, processing the agent and vendor data once for all of them
+            agent_calc = calculate_agent_profitability(agent_weekly)
+            vendor_calc = calculate_campaign_roas(vendor_weekly)
+            stats = aggregate_agency_stats(agency_weekly, agent_weekly, vendor_weekly,
+                                           agent_calc=agent_calc, vendor_calc=vendor_calc)
+            top_agents = get_top_performers(agent_weekly, n=10, agent_calc=agent_calc)
             
             # Format date range
             if start_date and end_date:
@@ -385,7 +391,7 @@ class ReportGenerator:
             
             # Add campaign analysis for management/admin users
             if include_campaigns and user_role in ['management', 'admin'] and not vendor_weekly.empty:
-                campaign_performance = get_campaign_performance(vendor_weekly)
+                campaign_performance = get_campaign_performance(vendor_weekly, vendor_calc=vendor_calc)
                 report_html += f"""
                 <h2>Campaign Performance (Week)</h2>
                 {self._format_campaign_table(campaign_performance)}
@@ -428,11 +434,15 @@ class ReportGenerator:
             if include_campaigns and user_role in ['management', 'admin']:
                 vendor_data = self._load_filtered_data('Daily Lead Vendor Totals', start_date, end_date, agency)
             
-            # Calculate metrics
-            stats = aggregate_agency_stats(agency_data, agent_data, vendor_data)
-            top_agents = get_top_performers(agent_data, n=15)
-            at_risk_agents = get_at_risk_agents(agent_data)
-            campaign_performance = get_campaign_performance(vendor_data) if not vendor_data.empty else pd.DataFrame()
+            # Calculate metrics, processing the agent and vendor data once for all of them
+            agent_calc = calculate_agent_profitability(agent_data)
+            vendor_calc = calculate_campaign_roas(vendor_data)
+            stats = aggregate_agency_stats(agency_data, agent_data, vendor_data,
+                                           agent_calc=agent_calc, vendor_calc=vendor_calc)
+            top_agents = get_top_performers(agent_data, n=15, agent_calc=agent_calc)
+            at_risk_agents = get_at_risk_agents(agent_data, agent_calc=agent_calc)
+            campaign_performance = (get_campaign_performance(vendor_data, vendor_calc=vendor_calc)
+                                    if not vendor_data.empty else pd.DataFrame())
             
             # Format report date and agency info
             if start_date and end_date:
@@ -506,8 +516,8 @@ class ReportGenerator:
                 return "<p>No agent data available.</p>"
             
             processed_agents = calculate_agent_profitability(agent_data)
-            top_agents = get_top_performers(agent_data, n=10)
-            at_risk_agents = get_at_risk_agents(agent_data)
+            top_agents = get_top_performers(agent_data, n=10, agent_calc=processed_agents)
+            at_risk_agents = get_at_risk_agents(agent_data, agent_calc=processed_agents)
             
             # Calculate some statistics
             avg_profitability = processed_agents['agentProfitability'].mean() if 'agentProfitability' in processed_agents.columns else 0
@@ -627,10 +637,12 @@ class ReportGenerator:
             if include_campaigns and user_role in ['management', 'admin']:
                 vendor_data = self._load_filtered_data('Daily Lead Vendor Totals', start_date, end_date, agency)
             
-            # Calculate comprehensive stats
-            stats = aggregate_agency_stats(agency_data, agent_data, vendor_data)
-            top_agents = get_top_performers(agent_data, n=5)
-            at_risk_count = len(get_at_risk_agents(agent_data))
+            # Calculate comprehensive stats, processing the agent data once for all of them
+            agent_calc = calculate_agent_profitability(agent_data)
+            stats = aggregate_agency_stats(agency_data, agent_data, vendor_data, agent_calc=agent_calc)
+            top_agents = get_top_performers(agent_data, n=5, agent_calc=agent_calc)
+            # Same threshold test as get_at_risk_agents, without filtering and sorting the agents
+            at_risk_count = stats['atRiskAgents']
             
             # Calculate ROI and other key metrics
             roi = ((stats['totalRevenue'] - stats['totalLeadSpend']) / stats['totalLeadSpend'] * 100) if stats['totalLeadSpend'] > 0 else 0
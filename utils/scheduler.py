@@ -11,11 +11,15 @@ from dataclasses import dataclass, asdict, field
 # Import email modules with fallback
 import email.message
 import base64
+import logging
 import threading
 import time
 
 from .settings import settings_manager, UserInfo
 
+# Shared with standalone_scheduler.py, which attaches the output handler
+logger = logging.getLogger("fortified.scheduler")
+
 @dataclass
 class ScheduledReport:
     """Represents a scheduled report configuration"""
@@ -134,7 +138,7 @@ class EmailService:
         """Send email with optional attachments"""
         try:
             if not settings_manager.validate_email_settings():
-                print("Email settings not configured")
+                logger.warning("Email settings not configured")
                 return False
             
             # Create simple email message
@@ -146,7 +150,7 @@ class EmailService:
             
             # Add attachments (simplified - no attachments for now to avoid complexity)
             if attachments:
-                print("Note: Attachments not supported in simplified email mode")
+                logger.info("Note: Attachments not supported in simplified email mode")
             
             # Send email
             server = smtplib.SMTP(self.settings.smtp_server, self.settings.smtp_port)
@@ -160,7 +164,7 @@ class EmailService:
             return True
             
         except Exception as e:
-            print(f"Error sending email: {e}")
+            logger.error(f"Error sending email: {e}")
             return False
     
     def send_report(self, report: ScheduledReport, report_data: str, 
@@ -201,12 +205,35 @@ class ReportScheduler:
         self.running = False
         self.scheduler_thread: Optional[threading.Thread] = None
         self.report_generators: Dict[str, Callable] = {}
+        # Reports can be run from several threads; only one may save and sync at a time
+        self._save_lock = threading.Lock()
+        # Modification time of the schedules file as of the last load or save
+        self._loaded_mtime = 0.0
         self.load_schedules()
     
+    def schedules_mtime(self) -> float:
+        """Get the modification time of the schedules file, or 0.0 if it is missing"""
+        try:
+            return os.path.getmtime(self.schedules_file)
+        except OSError:
+            return 0.0
+    
+    def reload_if_changed(self) -> bool:
+        """Reload the schedules only if the file changed since it was last loaded or saved
+        
+        Returns:
+            True if the schedules were reloaded
+        """
+        if self.schedules_mtime() == self._loaded_mtime:
+            return False
+        self.load_schedules()
+        return True
+    
     def load_schedules(self):
         """Load scheduled reports from JSON file"""
         if os.path.exists(self.schedules_file):
             try:
+                self._loaded_mtime = self.schedules_mtime()
                 with open(self.schedules_file, 'r') as f:
                     data = json.load(f)
                 
@@ -215,42 +242,46 @@ class ReportScheduler:
                         ScheduledReport(**report) for report in data['scheduled_reports']
                     ]
             except Exception as e:
-                print(f"Error loading schedules: {e}")
+                logger.error(f"Error loading schedules: {e}")
     
     def save_schedules(self):
         """Save scheduled reports to JSON file and sync to GitHub"""
         try:
-            # Save locally first
-            data = {
-                'scheduled_reports': [asdict(report) for report in self.scheduled_reports],
-                'last_updated': datetime.now().isoformat()
-            }
-            
-            with open(self.schedules_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            # Sync to GitHub if running in Streamlit
-            try:
-                import streamlit as st
-                from .github_sync import github_sync
+            # The lock also covers the GitHub sync: concurrent contents API
+            # updates of the same file would conflict on its sha
+            with self._save_lock:
+                # Save locally first
+                data = {
+                    'scheduled_reports': [asdict(report) for report in self.scheduled_reports],
+                    'last_updated': datetime.now().isoformat()
+                }
                 
-                if github_sync.is_configured():
-                    github_sync.update_scheduled_reports(
-                        self.scheduled_reports,
-                        "Auto-sync: Update scheduled reports from Streamlit interface"
-                    )
-                    print("✅ Synced scheduled reports to GitHub")
-                else:
-                    print("ℹ️  GitHub sync not configured (this is normal for local/GitHub Actions)")
-            except ImportError:
-                # Not running in Streamlit environment
-                print("ℹ️  Not syncing to GitHub (not in Streamlit environment)")
-            except Exception as e:
-                print(f"⚠️  Failed to sync to GitHub: {e}")
+                with open(self.schedules_file, 'w') as f:
+                    json.dump(data, f, indent=2)
+                self._loaded_mtime = self.schedules_mtime()
+                
+                # Sync to GitHub if running in Streamlit
+                try:
+                    import streamlit as st
+                    from .github_sync import github_sync
+                    
+                    if github_sync.is_configured():
+                        github_sync.update_scheduled_reports(
+                            self.scheduled_reports,
+                            "Auto-sync: Update scheduled reports from Streamlit interface"
+                        )
+                        logger.info("✅ Synced scheduled reports to GitHub")
+                    else:
+                        logger.info("ℹ️  GitHub sync not configured (this is normal for local/GitHub Actions)")
+                except ImportError:
+                    # Not running in Streamlit environment
+                    logger.info("ℹ️  Not syncing to GitHub (not in Streamlit environment)")
+                except Exception as e:
+                    logger.warning(f"⚠️  Failed to sync to GitHub: {e}")
             
             return True
         except Exception as e:
-            print(f"Error saving schedules: {e}")
+            logger.error(f"Error saving schedules: {e}")
             return False
     
     def register_report_generator(self, report_type: str, generator_func: Callable):
@@ -328,7 +359,7 @@ class ReportScheduler:
         """Run a single report"""
         try:
             if report.report_type not in self.report_generators:
-                print(f"No generator registered for report type: {report.report_type}")
+                logger.error(f"No generator registered for report type: {report.report_type}")
                 return False
             
             # Generate report
@@ -342,14 +373,14 @@ class ReportScheduler:
                 # Calculate next run for the next occurrence
                 report._calculate_next_run()
                 self.save_schedules()
-                print(f"Report '{report.name}' sent successfully")
+                logger.info(f"Report '{report.name}' sent successfully")
             else:
-                print(f"Failed to send report '{report.name}'")
+                logger.error(f"Failed to send report '{report.name}'")
             
             return success
             
         except Exception as e:
-            print(f"Error running report '{report.name}': {e}")
+            logger.error(f"Error running report '{report.name}': {e}")
             return False
     
     def start_scheduler(self):
@@ -360,14 +391,14 @@ class ReportScheduler:
         self.running = True
         self.scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
         self.scheduler_thread.start()
-        print("Report scheduler started")
+        logger.info("Report scheduler started")
     
     def stop_scheduler(self):
         """Stop the background scheduler"""
         self.running = False
         if self.scheduler_thread:
             self.scheduler_thread.join()
-        print("Report scheduler stopped")
+        logger.info("Report scheduler stopped")
     
     def _scheduler_loop(self):
         """Main scheduler loop"""
@@ -381,7 +412,7 @@ class ReportScheduler:
                 time.sleep(60)
                 
             except Exception as e:
-                print(f"Error in scheduler loop: {e}")
+                logger.error(f"Error in scheduler loop: {e}")
                 time.sleep(60)
     
     def test_email_settings(self) -> bool:
@@ -4,6 +4,7 @@ Settings module for managing user information and application configuration
 
 import json
 import os
+from collections import Counter
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -62,6 +63,7 @@ class SettingsManager:
     def __init__(self, settings_file: str = "settings.json"):
         self.settings_file = settings_file
         self.users: List[UserInfo] = []
+        self._by_email: Dict[str, UserInfo] = {}
         self.email_settings = EmailSettings()
         self.report_settings = ReportSettings()
         self.app_settings = AppSettings()
@@ -77,6 +79,7 @@ class SettingsManager:
                 # Load users
                 if 'users' in data:
                     self.users = [UserInfo(**user) for user in data['users']]
+                    self._index_users()
                 
                 # Load email settings
                 if 'email_settings' in data:
@@ -167,6 +170,10 @@ class SettingsManager:
             print(f"Error saving settings: {e}")
             return False
     
+    def _index_users(self):
+        """Rebuild the email -> user lookup after the user list changes"""
+        self._by_email = {user.email: user for user in self.users}
+    
     def _create_default_settings(self):
         """Create default settings"""
         # Add default admin user
@@ -177,12 +184,13 @@ class SettingsManager:
             agency="System"
         )
         self.users = [admin_user]
+        self._index_users()
         self.save_settings()
     
     def add_user(self, name: str, email: str, role: str, phone: Optional[str] = None, agency: Optional[str] = None) -> bool:
         """Add a new user"""
         # Check if email already exists
-        if any(user.email == email for user in self.users):
+        if email in self._by_email:
             return False
         
         new_user = UserInfo(
@@ -194,29 +202,28 @@ class SettingsManager:
         )
         
         self.users.append(new_user)
+        self._by_email[email] = new_user
         return self.save_settings()
     
     def update_user(self, email: str, **kwargs) -> bool:
         """Update user information"""
-        for user in self.users:
-            if user.email == email:
-                for key, value in kwargs.items():
-                    if hasattr(user, key):
-                        setattr(user, key, value)
-                return self.save_settings()
-        return False
+        user = self._by_email.get(email)
+        if user is None:
+            return False
+        for key, value in kwargs.items():
+            if hasattr(user, key):
+                setattr(user, key, value)
+        return self.save_settings()
     
     def remove_user(self, email: str) -> bool:
         """Remove a user"""
         self.users = [user for user in self.users if user.email != email]
+        self._by_email.pop(email, None)
         return self.save_settings()
     
     def get_user(self, email: str) -> Optional[UserInfo]:
         """Get user by email"""
-        for user in self.users:
-            if user.email == email:
-                return user
-        return None
+        return self._by_email.get(email)
     
     def get_users_by_role(self, role: str) -> List[UserInfo]:
         """Get all users with specific role"""
@@ -230,6 +237,10 @@ class SettingsManager:
         """Get all management team members"""
         return self.get_users_by_role('management')
     
+    def get_report_recipients(self) -> List[UserInfo]:
+        """Get the users reports can be emailed to (agency owners, then management)"""
+        return self.get_agency_owners() + self.get_management_team()
+    
     def get_notification_emails(self, role: Optional[str] = None) -> List[str]:
         """Get emails for users with notifications enabled"""
         users = self.users if role is None else self.get_users_by_role(role)
@@ -268,10 +279,12 @@ class SettingsManager:
     
     def get_settings_summary(self) -> Dict:
         """Get a summary of all settings"""
+        # Count every role in one pass over the users
+        role_counts = Counter(user.role for user in self.users)
         return {
             'total_users': len(self.users),
-            'agency_owners': len(self.get_agency_owners()),
-            'management_team': len(self.get_management_team()),
+            'agency_owners': role_counts['agency_owner'],
+            'management_team': role_counts['management'],
             'email_configured': self.validate_email_settings(),
             'app_name': self.app_settings.app_name,
             'version': self.app_settings.version
@@ -0,0 +1,60 @@
+"""
+Cached raw-value reads from Google Sheets for the diagnostic scripts
+"""
+
+import streamlit as st
+from typing import Dict, List, Tuple
+
+from .sheets_client import get_sheets_service
+
+
+def _render_options(unformatted: bool) -> Dict[str, str]:
+    """Map the unformatted flag to Sheets render options
+
+    Unformatted reads ask for dates as serial numbers explicitly, so raw
+    values can be compared against the FORMATTED_VALUE read of the same cells.
+    """
+    if unformatted:
+        return {'valueRenderOption': 'UNFORMATTED_VALUE', 'dateTimeRenderOption': 'SERIAL_NUMBER'}
+    return {'valueRenderOption': 'FORMATTED_VALUE'}
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_range(spreadsheet_id: str, rng: str, unformatted: bool = True) -> List[list]:
+    """Fetch the raw cell values of a single A1 range with caching
+
+    Args:
+        spreadsheet_id: Google Sheets ID
+        rng: A1 notation range including the sheet name
+        unformatted: Return raw values instead of display strings
+
+    Returns:
+        List of rows, each a list of cell values
+    """
+    result = get_sheets_service().spreadsheets().values().get(
+        spreadsheetId=spreadsheet_id,
+        range=rng,
+        **_render_options(unformatted)
+    ).execute()
+    return result.get('values', [])
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_ranges(spreadsheet_id: str, ranges: Tuple[str, ...], unformatted: bool = True) -> List[List[list]]:
+    """Fetch the raw cell values of several A1 ranges in one batchGet with caching
+
+    Args:
+        spreadsheet_id: Google Sheets ID
+        ranges: Tuple of A1 notation ranges including sheet names
+        unformatted: Return raw values instead of display strings
+
+    Returns:
+        List with the rows of each range, in request order
+    """
+    result = get_sheets_service().spreadsheets().values().batchGet(
+        spreadsheetId=spreadsheet_id,
+        ranges=list(ranges),
+        **_render_options(unformatted),
+        fields='valueRanges(range,values)'
+    ).execute()
+    return [value_range.get('values', []) for value_range in result.get('valueRanges', [])]
@@ -0,0 +1,51 @@
+"""
+Shared Google Sheets client for the app and the diagnostic scripts
+"""
+
+import threading
+import httplib2
+import streamlit as st
+from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+from typing import Tuple
+
+# Scopes used by the diagnostic scripts, which only read
+READONLY_SCOPES = ('https://www.googleapis.com/auth/spreadsheets.readonly',)
+
+# httplib2 connections are not thread-safe, so each thread keeps its own services
+_thread_local = threading.local()
+
+
+@st.cache_resource
+def get_credentials(scopes: Tuple[str, ...] = READONLY_SCOPES) -> service_account.Credentials:
+    """Parse the service account secrets once per scope set and share them across reruns and sessions"""
+    return service_account.Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"],
+        scopes=list(scopes)
+    )
+
+
+def get_sheets_service(scopes: Tuple[str, ...] = READONLY_SCOPES, timeout: int = 10):
+    """Get a Sheets service bound to the current thread
+
+    The service reuses one keep-alive HTTP connection for every call made
+    from the thread, and is built from the discovery document bundled with
+    googleapiclient instead of downloading it.
+
+    Args:
+        scopes: OAuth scopes for the service account credentials
+        timeout: Socket timeout in seconds for the HTTP connection
+
+    Returns:
+        Sheets v4 service resource
+    """
+    services = getattr(_thread_local, 'services', None)
+    if services is None:
+        services = _thread_local.services = {}
+
+    key = (scopes, timeout)
+    if key not in services:
+        http = AuthorizedHttp(get_credentials(scopes), http=httplib2.Http(timeout=timeout))
+        services[key] = build('sheets', 'v4', http=http, cache_discovery=False, static_discovery=True)
+    return services[key]